@@ -14,6 +14,11 @@ class Settings(BaseSettings):
     GEMINI_THINKING_LEVEL: Optional[str] = "low"  # Applied to Pro model only
     GEMINI_IMAGE_SIZE: Optional[str] = "1K"  # Image resolution (1K, 2K, 4K for Pro)
     GEMINI_IMAGE_ASPECT_RATIO: Optional[str] = "1:1"  # Aspect ratio for generated images
+    GEMINI_UPLOAD_REFERENCE_IMAGES: bool = True  # Upload reference images once via the Files API
+    CACHE_PRODUCT_IMAGES: bool = False  # Reuse views for identical create/edit requests (dev iteration)
+    # Reuse panel textures for identical prompt/workflow/reference (dev iteration). Stored
+    # on disk in backend/texture_cache/ (up to 2GB, LRU) and kept across restarts
+    CACHE_PANEL_TEXTURES: bool = False
     
     # Artifact Storage
     SAVE_ARTIFACTS_LOCALLY: bool = False  # Save to filesystem for testing/debugging
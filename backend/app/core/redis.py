@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 
+import orjson
 import redis
 from redis.exceptions import RedisError
 
@@ -36,38 +36,93 @@ class RedisService:
     def __init__(self, redis_url: str | None = None):
         self._url = redis_url or _resolve_redis_url()
         self.client = self._create_client(self._url)
-        self._fallback_store: dict[str, str] = {}
+        self._binary_client: redis.Redis | None = None
+        self._fallback_store: dict[str, str | bytes] = {}
         self._use_fallback = False
 
     @staticmethod
     def _create_client(redis_url: str) -> redis.Redis:
         return redis.from_url(redis_url, decode_responses=True)
 
+    @property
+    def binary_client(self) -> redis.Redis:
+        """Client that leaves replies as bytes, for values that aren't UTF-8 text."""
+        if self._binary_client is None:
+            self._binary_client = redis.from_url(self._url)
+        return self._binary_client
+
     def get(self, key: str) -> str | None:
         try:
             if self._use_fallback:
-                return self._fallback_store.get(key)
+                return self._fallback_get(key)
             return self.client.get(key)
         except RedisError:
             self._use_fallback = True
-            return self._fallback_store.get(key)
+            return self._fallback_get(key)
+
+    def _fallback_get(self, key: str) -> str | None:
+        # Decoded like the decode_responses client, so get() returns str either way
+        value = self._fallback_store.get(key)
+        return value.decode() if isinstance(value, bytes) else value
 
-    def set(self, key: str, value: str, ex: int | None = None) -> bool:
+    def get_bytes(self, key: str) -> bytes | None:
         try:
             if self._use_fallback:
-                self._fallback_store[key] = value
-                return True
+                return self._fallback_get_bytes(key)
+            return self.binary_client.get(key)
+        except RedisError:
+            self._use_fallback = True
+            return self._fallback_get_bytes(key)
+
+    def _fallback_get_bytes(self, key: str) -> bytes | None:
+        value = self._fallback_store.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    def set(self, key: str, value: str | bytes, ex: int | None = None) -> bool:
+        try:
+            if self._use_fallback:
+                return self._fallback_set(key, value)
             return self.client.set(key, value, ex=ex)
         except RedisError:
             self._use_fallback = True
-            self._fallback_store[key] = value
-            return True
+            return self._fallback_set(key, value)
+
+    def _fallback_set(self, key: str, value: str | bytes) -> bool:
+        # Shared by every writer; the in-memory store ignores expiry
+        self._fallback_store[key] = value
+        return True
 
     def set_json(self, key: str, value: object, ex: int | None = None) -> bool:
         """Serialize value to JSON before storing."""
-        payload = json.dumps(value, ensure_ascii=False)
+        payload = orjson.dumps(value)
         return self.set(key, payload, ex=ex)
 
+    def save_many(self, pairs: list[tuple[str, object]], ex: int | None = None) -> bool:
+        """Store several values in one pipelined round-trip, each expiring like set(ex=...).
+
+        bytes values are stored as-is; anything else is serialized to JSON.
+        """
+        payloads = [
+            (key, value if isinstance(value, bytes) else orjson.dumps(value))
+            for key, value in pairs
+        ]
+        try:
+            if self._use_fallback:
+                return self._fallback_set_many(payloads)
+            pipe = self.binary_client.pipeline()
+            for key, payload in payloads:
+                pipe.set(key, payload, ex=ex)
+            pipe.execute()
+            return True
+        except RedisError:
+            self._use_fallback = True
+            return self._fallback_set_many(payloads)
+
+    def _fallback_set_many(self, payloads: list[tuple[str, bytes]]) -> bool:
+        for key, payload in payloads:
+            self._fallback_set(key, payload)
+        return True
+
     def setex(self, key: str, time: int, value: str) -> bool:
         """Set key with expiration time; fallback ignores expiry."""
         try:
@@ -95,8 +150,8 @@ class RedisService:
         if raw_value is None:
             return default
         try:
-            return json.loads(raw_value)
-        except json.JSONDecodeError:
+            return orjson.loads(raw_value)
+        except orjson.JSONDecodeError:
             logger.warning("Failed to decode JSON for key %s", key)
             return default
 
@@ -14,8 +14,7 @@ from app.models.product_state import (
     ProductStatus,
     ProductIteration,
     TrellisArtifacts,
-    save_product_state,
-    save_product_status,
+    save_product_snapshot,
     clear_product_state,
 )
 from app.models.packaging_state import (
@@ -88,8 +87,6 @@ async def seed_product(request: SeedProductRequest):
         iterations=[iteration],
     )
     
-    save_product_state(state)
-    
     # Update status for frontend polling
     status = ProductStatus(
         status="complete",
@@ -98,7 +95,7 @@ async def seed_product(request: SeedProductRequest):
         model_file=request.model_url,
         preview_image=request.preview_images[0] if request.preview_images else None,
     )
-    save_product_status(status)
+    save_product_snapshot(state, status)
     
     logger.info("[demo] ✅ Product state seeded successfully")
     return {
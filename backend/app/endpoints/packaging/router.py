@@ -249,54 +249,41 @@ Generate a complete 3D mockup with full-coverage design on all faces."""
         # PHASE 2: Parallelize all panels using 3D mockup as reference
         logger.info(f"[packaging-router] PHASE 2: Generating {len(request.panel_ids)} panels in parallel")
         
-        # Create parallel tasks for ALL panels
-        async def generate_panel(panel_id: str):
-            try:
-                current_state = get_packaging_state()
-                current_state.generating_panel = panel_id
+        def mark_panel_done(panel_id: str, texture_url: Optional[str]) -> None:
+            if not texture_url:
+                return
+            # Remove from generating list as soon as the panel is ready
+            current_state = get_packaging_state()
+            if panel_id in current_state.generating_panels:
+                current_state.generating_panels.remove(panel_id)
                 save_packaging_state(current_state)
-                
-                panel_dims = request.panels_info.get(panel_id, {})
-                texture_url = await panel_generation_service.generate_panel_texture(
+        
+        # Generate ALL panels in one batch, using the 3D mockup as reference for all
+        results = await panel_generation_service.generate_panel_textures_batch(
+            [
+                dict(
                     panel_id=panel_id,
                     prompt=request.prompt,
                     package_type=request.package_type,
-                    panel_dimensions=panel_dims,
+                    panel_dimensions=request.panels_info.get(panel_id, {}),
                     package_dimensions=request.package_dimensions,
-                    reference_mockup=master_mockup_url,  # Use 3D mockup as reference for all
+                    reference_mockup=master_mockup_url,
                     workflow=workflow,
                     old_texture_url=None,  # 3D mockup is the reference now
                 )
-                
-                if texture_url:
-                    # Remove from generating list
-                    current_state = get_packaging_state()
-                    if panel_id in current_state.generating_panels:
-                        current_state.generating_panels.remove(panel_id)
-                        save_packaging_state(current_state)
-                    return (panel_id, texture_url, panel_dims)
-                else:
-                    return (panel_id, None, panel_dims)
-            except Exception as e:
-                logger.error(f"[packaging-router] Error generating panel {panel_id}: {e}")
-                return (panel_id, None, None)
-        
-        # Run ALL panels in parallel
-        results = await asyncio.gather(*[generate_panel(pid) for pid in request.panel_ids], return_exceptions=True)
+                for panel_id in request.panel_ids
+            ],
+            on_panel_done=mark_panel_done,
+        )
         
         # Process results
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"[packaging-router] Task exception: {result}")
-                continue
-            
-            panel_id, texture_url, panel_dims = result
+        for panel_id, texture_url in results.items():
             if texture_url:
                 generated_textures[panel_id] = PanelTexture(
                     panel_id=panel_id,
                     texture_url=texture_url,
                     prompt=request.prompt,
-                    dimensions=panel_dims,
+                    dimensions=request.panels_info.get(panel_id, {}),
                 )
             else:
                 failed_panels.append(panel_id)
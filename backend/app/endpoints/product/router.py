@@ -2,15 +2,17 @@ import asyncio
 import logging
 from typing import Set
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.models.product_state import (
     ProductState,
+    add_status_listener,
     ProductStatus,
     get_product_state,
     get_product_status,
+    save_product_snapshot,
     save_product_state,
     save_product_status,
     clear_product_state,
@@ -34,6 +36,11 @@ def _is_demo_mock_mode() -> bool:
 router = APIRouter(prefix="/product", tags=["product"])
 _background_tasks: Set[asyncio.Task] = set()
 
+# Statuses after which /status/stream has nothing more to report
+_STREAM_END_STATUSES = frozenset({"idle", "complete", "error"})
+# Writes from other processes don't notify the stream, so it re-reads Redis at least this often
+_STATUS_STREAM_RECHECK = 5.0  # Seconds
+
 
 class ProductCreateRequest(BaseModel):
     prompt: str = Field(..., min_length=5, max_length=2000)
@@ -65,14 +72,13 @@ def _auto_recover_if_needed(state: ProductState) -> bool:
     state.status = "idle"
     state.message = "Recovered from interrupted generation"
     state.generation_started_at = None
-    save_product_state(state)
 
     status_payload = ProductStatus(
         status="idle",
         progress=0,
         message="Recovered from interrupted generation",
     )
-    save_product_status(status_payload)
+    save_product_snapshot(state, status_payload)
     return True
 
 
@@ -110,10 +116,9 @@ async def start_create(request: ProductCreateRequest):
     state.trellis_output = None
     state.iterations = []
     state.last_error = None
-    save_product_state(state)
 
     payload = ProductStatus(status="pending", progress=0, message="Preparing product generation")
-    save_product_status(payload)
+    save_product_snapshot(state, payload)
 
     # Use mock pipeline in demo mode, real pipeline otherwise
     if is_mock:
@@ -144,10 +149,9 @@ async def start_edit(request: ProductEditRequest):
     state.message = "Preparing edit request"
     state.in_progress = True
     state.generation_started_at = _utcnow()  # Track start time for frontend timer
-    save_product_state(state)
 
     payload = ProductStatus(status="pending", progress=0, message="Preparing edit request")
-    save_product_status(payload)
+    save_product_snapshot(state, payload)
 
     # Use mock pipeline in demo mode, real pipeline otherwise
     if is_mock:
@@ -207,14 +211,13 @@ async def start_trellis_only(request: TrellisOnlyRequest):
     state.generation_started_at = _utcnow()
     state.images = request.images
     state.last_error = None
-    save_product_state(state)
     
     payload = ProductStatus(
         status="pending",
         progress=0,
         message="Preparing 3D generation from pre-generated images"
     )
-    save_product_status(payload)
+    save_product_snapshot(state, payload)
     
     task = asyncio.create_task(
         product_pipeline_service.run_trellis_only(
@@ -228,17 +231,54 @@ async def start_trellis_only(request: TrellisOnlyRequest):
 
 
 @router.get("")
-async def fetch_product_state():
+async def fetch_product_state() -> ProductState:
     """Return the entire persisted state blob for the frontend to hydrate."""
-    state = get_product_state()
-    return state.model_dump(mode="json")
+    # Returning the model lets FastAPI serialize it straight to JSON bytes in
+    # pydantic-core, skipping a dict round-trip of the (image-heavy) state
+    return get_product_state()
 
 
 @router.get("/status")
-async def fetch_product_status():
+async def fetch_product_status() -> ProductStatus:
     """Return the lightweight status payload (small + poll-friendly)."""
-    status = get_product_status()
-    return status.model_dump(mode="json")
+    return get_product_status()
+
+
+@router.get("/status/stream")
+async def stream_product_status(request: Request):
+    """Stream status payloads as server-sent events until the current run ends.
+
+    Each status write in this process pushes a new event immediately, so
+    clients learn about completion without polling /status.
+    """
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+
+    async def events():
+        remove_listener = add_status_listener(lambda: loop.call_soon_threadsafe(changed.set))
+        last_payload = None
+        try:
+            while True:
+                changed.clear()
+                status = get_product_status()
+                payload = status.model_dump_json()
+                if payload != last_payload:
+                    yield f"data: {payload}\n\n"
+                    last_payload = payload
+                if status.status in _STREAM_END_STATUSES or await request.is_disconnected():
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), _STATUS_STREAM_RECHECK)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            remove_listener()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @router.post("/recover")
@@ -281,7 +321,6 @@ async def rewind_product(iteration_index: int):
     state.message = "Rewound to previous version"
     state.in_progress = False
     state.last_error = None
-    save_product_state(state)
 
     preview = None
     if target_iteration.trellis_output and target_iteration.trellis_output.no_background_images:
@@ -293,7 +332,7 @@ async def rewind_product(iteration_index: int):
         model_file=target_iteration.trellis_output.model_file if target_iteration.trellis_output else None,
         preview_image=preview,
     )
-    save_product_status(status_payload)
+    save_product_snapshot(state, status_payload)
 
     return {
         "status": "rewound",
@@ -1,11 +1,13 @@
+import asyncio
+import functools
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any, Literal, Optional
 
-from app.integrations.trellis import trellis_service, TrellisOutput
+from app.integrations.trellis import get_trellis_service, trellis_executor, TrellisOutput
 from app.core.redis import redis_service
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -88,17 +90,22 @@ async def generate_3d_asset(request: Generate3DRequest):
         use_multi = request.use_multi_image if request.use_multi_image is not None else len(request.images) > 1
         multi_algo = request.multiimage_algo
 
-        output = trellis_service.generate_3d_asset(
-            images=request.images,
-            seed=request.seed,
-            texture_size=config["texture_size"],
-            mesh_simplify=config["mesh_simplify"],
-            ss_sampling_steps=config["ss_sampling_steps"],
-            ss_guidance_strength=config["ss_guidance_strength"],
-            slat_sampling_steps=config["slat_sampling_steps"],
-            slat_guidance_strength=config["slat_guidance_strength"],
-            use_multi_image=use_multi,
-            multiimage_algo=multi_algo,
+        # Blocking call; run it off the event loop so other requests keep being served
+        output = await asyncio.get_running_loop().run_in_executor(
+            trellis_executor,
+            functools.partial(
+                get_trellis_service().generate_3d_asset,
+                images=request.images,
+                seed=request.seed,
+                texture_size=config["texture_size"],
+                mesh_simplify=config["mesh_simplify"],
+                ss_sampling_steps=config["ss_sampling_steps"],
+                ss_guidance_strength=config["ss_guidance_strength"],
+                slat_sampling_steps=config["slat_sampling_steps"],
+                slat_guidance_strength=config["slat_guidance_strength"],
+                use_multi_image=use_multi,
+                multiimage_algo=multi_algo,
+            ),
         )
         logger.info("Successfully generated 3D asset")
         _set_status(
@@ -113,8 +120,7 @@ async def generate_3d_asset(request: Generate3DRequest):
         )
         return output
     except Exception as e:
-        logger.error(f"Error generating 3D asset: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error generating 3D asset: %s", e)
         _set_status(
             {
                 "status": "error",
@@ -1,24 +1,42 @@
 import asyncio
+import hashlib
+import importlib.util
+import io
 import logging
 import base64
-from typing import Dict, Any, List, Optional
+import functools
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
 
 from pydantic import ValidationError
 
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets concurrently rendered views share one TLS connection (needs h2)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Files API uploads expire after 48h; stop reusing them an hour before that
+REFERENCE_UPLOAD_TTL = 47 * 3600  # Seconds
+
 class GeminiError(Exception):
     """Gemini service errors."""
     pass
 
 class QuotaExceededError(GeminiError):
     """API quota exceeded."""
-    pass
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after  # Seconds from the Retry-After header, if sent
 
 class SafetyError(GeminiError):
     """Content blocked by safety filters."""
@@ -29,7 +47,10 @@ class GeminiImageService:
     
     def __init__(self):
         if settings.GEMINI_API_KEY:
-            self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+            self.client = genai.Client(
+                api_key=settings.GEMINI_API_KEY,
+                http_options=types.HttpOptions(client_args={"http2": True}) if HTTP2_AVAILABLE else None,
+            )
         else:
             self.client = None
             logger.warning("Gemini API key not found for Image Service")
@@ -41,6 +62,13 @@ class GeminiImageService:
         # Image generation settings
         self.image_size = settings.GEMINI_IMAGE_SIZE
         self.aspect_ratio = settings.GEMINI_IMAGE_ASPECT_RATIO
+        self.upload_references = settings.GEMINI_UPLOAD_REFERENCE_IMAGES
+        
+        # Reference image uploads by content hash, each resolving to (file uri, mime type,
+        # reuse deadline) or None if it failed. Every view of a request (and every panel
+        # of a package) sends the same reference, so callers with that image share one upload.
+        self._reference_uploads: Dict[str, Future] = {}
+        self._upload_lock = threading.Lock()
         
         logger.info(f"[gemini-image] Initialized with Pro model: {self.pro_model}, Flash model: {self.flash_model}")
 
@@ -52,6 +80,7 @@ class GeminiImageService:
         reference_images: Optional[List[str]] = None,
         is_texture: bool = False,
         base_description: Optional[str] = None,
+        raise_on_quota: bool = False,
     ) -> List[str]:
         """Generate clean product views using Gemini Image API (synchronous).
         
@@ -60,26 +89,33 @@ class GeminiImageService:
             workflow: "create" or "edit" - determines model selection
             image_count: Number of images to generate
             reference_images: Reference images for edit workflow
+            raise_on_quota: Raise QuotaExceededError instead of skipping the view,
+                for callers that back off and retry (panel generation)
             
         Returns:
             List of base64-encoded image data URLs
         """
-        if not self.client:
-            raise GeminiError("Gemini client not initialized for product images")
-        
-        # Workflow-based model selection (hardcoded policy)
-        # Note: Image generation models don't support thinking levels, so we disable it
-        if workflow == "create":
-            model_to_use = self.pro_model
-            thinking = None  # Image generation models don't support thinking
-            logger.info(f"[gemini] CREATE workflow: using {model_to_use} (thinking disabled for image models)")
-        elif workflow == "edit":
-            model_to_use = self.flash_model
-            thinking = None  # Flash doesn't support thinking
-            logger.info(f"[gemini] EDIT workflow: using {model_to_use} (thinking disabled)")
-        else:
-            raise ValueError(f"Unknown workflow: {workflow}. Expected 'create' or 'edit'")
+        return list(
+            self.iter_product_images_sync(
+                prompt, workflow, image_count, reference_images, is_texture, base_description, raise_on_quota
+            )
+        )
+
+    def iter_product_images_sync(
+        self,
+        prompt: str,
+        workflow: str,
+        image_count: int = 1,
+        reference_images: Optional[List[str]] = None,
+        is_texture: bool = False,
+        base_description: Optional[str] = None,
+        raise_on_quota: bool = False,
+    ) -> Iterator[str]:
+        """Yield product views (base64 data URLs) as each one is generated.
         
+        Same arguments as generate_product_images_sync.
+        """
+        model_to_use = self._select_model(workflow)
         valid_images = []
         
         # For /create flow: generate first image, then use it as reference for additional angles
@@ -87,52 +123,77 @@ class GeminiImageService:
         is_create_flow = workflow == "create"
         
         for i in range(image_count):
-            try:
-                # For create flow: first image establishes the product, subsequent use it as reference
-                if is_create_flow and i == 0:
-                    # First view: establish the product design
-                    img = self._generate_single_image(
-                        prompt,
-                        None,
-                        thinking,
-                        model_to_use,
-                        angle_index=i,
-                        is_texture=is_texture,
-                        base_description=base_description,
-                    )
-                elif is_create_flow and i > 0:
-                    # Subsequent views: same product from different angles
-                    img = self._generate_single_image(
-                        prompt,
-                        valid_images[:1],
-                        thinking,
-                        model_to_use,
-                        angle_index=i,
-                        is_texture=is_texture,
-                        base_description=base_description,
-                    )
-                else:
-                    # Edit flow: use provided reference
-                    img = self._generate_single_image(
-                        prompt,
-                        reference_images,
-                        thinking,
-                        model_to_use,
-                        angle_index=i,
-                        is_texture=is_texture,
-                        base_description=base_description,
-                    )
-                
-                if img:
-                    valid_images.append(img)
-                    logger.info(f"[gemini] Image {i+1}/{image_count} generated successfully with model {model_to_use}")
-                else:
-                    logger.warning(f"[gemini] Image {i+1}/{image_count} generation returned None")
-            except Exception as exc:
-                logger.error(f"[gemini] Image {i+1}/{image_count} generation failed: {exc}")
+            img = self._generate_view(
+                i,
+                image_count,
+                prompt,
+                valid_images[:1] if is_create_flow else reference_images,
+                model_to_use,
+                is_texture=is_texture,
+                base_description=base_description,
+                raise_on_quota=raise_on_quota,
+            )
+            if img:
+                valid_images.append(img)
+                yield img
         
         logger.info(f"[gemini] Generated {len(valid_images)}/{image_count} valid product images using {model_to_use}")
-        return valid_images
+    
+    def _select_model(self, workflow: str) -> str:
+        """Pick the model for a workflow (hardcoded policy)."""
+        if not self.client:
+            raise GeminiError("Gemini client not initialized for product images")
+        
+        # Note: Image generation models don't support thinking levels, so it stays disabled
+        if workflow == "create":
+            logger.info(f"[gemini] CREATE workflow: using {self.pro_model} (thinking disabled for image models)")
+            return self.pro_model
+        if workflow == "edit":
+            logger.info(f"[gemini] EDIT workflow: using {self.flash_model} (thinking disabled)")
+            return self.flash_model
+        raise ValueError(f"Unknown workflow: {workflow}. Expected 'create' or 'edit'")
+    
+    def _generate_view(
+        self,
+        index: int,
+        image_count: int,
+        prompt: str,
+        reference_images: Optional[List[str]],
+        model: str,
+        is_texture: bool = False,
+        base_description: Optional[str] = None,
+        raise_on_quota: bool = False,
+    ) -> Optional[str]:
+        """Generate view `index`; failures are logged and return None.
+        
+        With raise_on_quota, QuotaExceededError propagates so the caller can
+        back off instead of burning the remaining views on 429s. Otherwise a
+        rate-limited view is skipped like any other failed view, and the views
+        that succeeded are kept.
+        """
+        try:
+            img = self._generate_single_image(
+                prompt,
+                reference_images,
+                None,  # Image generation models don't support thinking
+                model,
+                angle_index=index,
+                is_texture=is_texture,
+                base_description=base_description,
+            )
+        except QuotaExceededError as exc:
+            if raise_on_quota:
+                raise
+            logger.error(f"[gemini] Image {index+1}/{image_count} skipped, quota exceeded: {exc}")
+            return None
+        except Exception as exc:
+            logger.error(f"[gemini] Image {index+1}/{image_count} generation failed: {exc}")
+            return None
+        if img:
+            logger.info(f"[gemini] Image {index+1}/{image_count} generated successfully with model {model}")
+        else:
+            logger.warning(f"[gemini] Image {index+1}/{image_count} generation returned None")
+        return img
     
     async def generate_product_images(
         self,
@@ -142,6 +203,7 @@ class GeminiImageService:
         reference_images: Optional[List[str]] = None,
         is_texture: bool = False,
         base_description: Optional[str] = None,
+        raise_on_quota: bool = False,
     ) -> List[str]:
         """Generate clean product views using Gemini Image API (async wrapper).
         
@@ -151,6 +213,7 @@ class GeminiImageService:
             image_count: Number of images to generate
             reference_images: Reference images for edit workflow
             is_texture: If True, bypass "product photograph" enhancement (for flat textures)
+            raise_on_quota: Raise QuotaExceededError instead of skipping the view
             
         Returns:
             List of base64-encoded image data URLs
@@ -163,8 +226,66 @@ class GeminiImageService:
             reference_images,
             is_texture,
             base_description,
+            raise_on_quota,
         )
 
+    async def generate_product_images_iter(
+        self,
+        prompt: str,
+        workflow: str,
+        image_count: int = 1,
+        reference_images: Optional[List[str]] = None,
+        is_texture: bool = False,
+        base_description: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield product views as they are generated (async wrapper).
+        
+        Views that share a reference (every edit view, and every create view
+        after the one that establishes the product) render concurrently on
+        worker threads. Views are still yielded in angle order, so callers can
+        start on the first view while the remaining angles render.
+        """
+        model = self._select_model(workflow)
+        generate = functools.partial(
+            self._generate_view,
+            image_count=image_count,
+            prompt=prompt,
+            model=model,
+            is_texture=is_texture,
+            base_description=base_description,
+        )
+        
+        produced = 0
+        next_index = 0
+        references = reference_images
+        if workflow == "create":
+            # The first valid view establishes the product; the other angles reference it
+            references = None
+            while references is None and next_index < image_count:
+                image = await asyncio.to_thread(generate, next_index, reference_images=None)
+                next_index += 1
+                if image:
+                    references = [image]
+                    produced += 1
+                    yield image
+        
+        pending = [
+            asyncio.ensure_future(asyncio.to_thread(generate, index, reference_images=references))
+            for index in range(next_index, image_count)
+        ]
+        try:
+            for view in pending:
+                image = await view
+                if image:
+                    produced += 1
+                    yield image
+        finally:
+            for view in pending:
+                # Views nobody awaits anymore (the consumer stopped or failed) still finish
+                # on their threads; consume their outcome so it isn't reported as lost
+                view.add_done_callback(_discard_outcome)
+        logger.info(f"[gemini] Generated {produced}/{image_count} valid product images using {model}")
+
     def _generate_single_image(
         self,
         prompt: str,
@@ -220,32 +341,10 @@ class GeminiImageService:
         
         contents: List[types.Part | str] = [enhanced_prompt]
         if reference_images:
-            part = _image_to_part(reference_images[0])
+            part = self._reference_part(reference_images[0])
             if part:
                 contents.insert(1, part)  # Reference image after enhanced prompt
-        # We use model_construct to BYPASS Pydantic validation because the SDK v1.47.0 
-        # is missing fields like 'thinking_level' and 'image_size' that the API supports.
-        
-        thinking_cfg = None
-        if thinking_level:
-            # Create ThinkingConfig with extra fields allowed
-            thinking_cfg = types.ThinkingConfig.model_construct(
-                thinking_level=thinking_level
-            )
-            
-        image_cfg = None
-        image_config_kwargs: Dict[str, Any] = {"aspect_ratio": "1:1"}
-        if self.image_size:
-            image_config_kwargs["image_size"] = self.image_size
-        
-        if image_config_kwargs:
-            image_cfg = types.ImageConfig.model_construct(**image_config_kwargs)
-
-        # Construct main config bypassing validation
-        config = types.GenerateContentConfig.model_construct(
-            thinking_config=thinking_cfg,
-            image_config=image_cfg
-        )
+        config = _generate_content_config(thinking_level, self.image_size)
 
         try:
             logger.info(f"[gemini] Calling Gemini API with model: {model}, prompt length: {len(enhanced_prompt)}")
@@ -257,10 +356,126 @@ class GeminiImageService:
             )
             logger.info(f"[gemini] Received response from Gemini API. Response type: {type(response)}")
             return _extract_first_image(response)
+        except genai_errors.APIError as exc:
+            if exc.code == 429:
+                logger.warning(f"[gemini] Gemini API quota exceeded: {exc}")
+                raise QuotaExceededError(
+                    f"Gemini API quota exceeded: {exc}",
+                    retry_after=_retry_after_seconds(exc),
+                ) from exc
+            logger.error(f"[gemini] Gemini API call failed: {exc}", exc_info=True)
+            raise GeminiError(f"Gemini API call failed: {exc}") from exc
         except Exception as exc:
             logger.error(f"[gemini] Gemini API call failed: {exc}", exc_info=True)
             raise GeminiError(f"Gemini API call failed: {exc}") from exc
 
+    def _reference_part(self, image_str: str) -> Optional[types.Part]:
+        """Content part for a reference image, uploaded once through the Files API.
+
+        Later calls with the same image send its file URI instead of the
+        inline bytes. Falls back to inline data if the upload fails.
+        """
+        if not self.upload_references or not image_str.startswith("data:image"):
+            return _image_to_part(image_str)
+        try:
+            image_bytes, mime = _decode_reference_image(image_str)
+        except ValueError as exc:
+            logger.warning(f"Failed to convert reference image for Gemini input: {exc}")
+            return None
+
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        now = time.monotonic()
+        with self._upload_lock:  # Held only to find or claim this image's upload, never across it
+            upload = self._reference_uploads.get(digest)
+            claimed = upload is None or (upload.done() and not _upload_usable(upload, now))
+            if claimed:
+                self._reference_uploads = {
+                    key: value
+                    for key, value in self._reference_uploads.items()
+                    if not value.done() or _upload_usable(value, now)
+                }
+                upload = self._reference_uploads[digest] = Future()
+        if claimed:
+            self._upload_reference(upload, image_bytes, mime, now)
+        uploaded = upload.result()  # Waits only on an upload of this same image
+        if uploaded is None:  # Upload failed; the next call with this image retries it
+            return types.Part.from_bytes(data=image_bytes, mime_type=mime)
+        return types.Part.from_uri(file_uri=uploaded[0], mime_type=uploaded[1])
+
+    def _upload_reference(self, upload: Future, image_bytes: bytes, mime: str, now: float) -> None:
+        """Upload a reference image and resolve `upload` with (uri, mime, reuse deadline), or None."""
+        uploaded = None
+        try:
+            file = self.client.files.upload(
+                file=io.BytesIO(image_bytes),
+                config=types.UploadFileConfig(mime_type=mime),
+            )
+            if not file.uri:
+                raise GeminiError("upload returned no file URI")
+            uploaded = (file.uri, file.mime_type or mime, now + REFERENCE_UPLOAD_TTL)
+            logger.info("[gemini] Uploaded reference image (%d bytes) as %s", len(image_bytes), file.uri)
+        except Exception as exc:
+            logger.warning("[gemini] Reference upload failed, sending it inline: %s", exc)
+        finally:
+            upload.set_result(uploaded)  # Always resolve, so callers waiting on it never hang
+
+
+def _upload_usable(upload: Future, now: float) -> bool:
+    """Whether a finished reference upload succeeded and can still be referenced."""
+    uploaded = upload.result()
+    return uploaded is not None and uploaded[2] > now
+
+
+def _discard_outcome(future: "asyncio.Future") -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+@lru_cache(maxsize=8)
+def _generate_content_config(
+    thinking_level: Optional[str],
+    image_size: Optional[str],
+) -> types.GenerateContentConfig:
+    """Build the request config once per (thinking_level, image_size).
+    
+    Every panel and product call sends the same config; the SDK copies it
+    before serializing, so a shared instance is safe.
+    """
+    # We use model_construct to BYPASS Pydantic validation because the SDK v1.47.0 
+    # is missing fields like 'thinking_level' and 'image_size' that the API supports.
+    
+    thinking_cfg = None
+    if thinking_level:
+        # Create ThinkingConfig with extra fields allowed
+        thinking_cfg = types.ThinkingConfig.model_construct(
+            thinking_level=thinking_level
+        )
+        
+    image_cfg = None
+    image_config_kwargs: Dict[str, Any] = {"aspect_ratio": "1:1"}
+    if image_size:
+        image_config_kwargs["image_size"] = image_size
+    
+    if image_config_kwargs:
+        image_cfg = types.ImageConfig.model_construct(**image_config_kwargs)
+
+    # Construct main config bypassing validation
+    return types.GenerateContentConfig.model_construct(
+        thinking_config=thinking_cfg,
+        image_config=image_cfg
+    )
+
+
+def _retry_after_seconds(exc: genai_errors.APIError) -> Optional[float]:
+    """Read the Retry-After header (in seconds) from a failed API response."""
+    headers = getattr(exc.response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
 
 def _extract_first_image(response) -> Optional[str]:
     try:
@@ -304,14 +519,24 @@ def _image_to_part(image_str: str) -> Optional[types.Part]:
     """Convert a data URL/base64 string into a Gemini content part."""
     try:
         if image_str.startswith("data:image"):
-            header, b64_data = image_str.split(",", 1)
-            mime = header.split(";")[0].split(":")[1]
-            image_bytes = base64.b64decode(b64_data)
+            image_bytes, mime = _decode_reference_image(image_str)
             return types.Part.from_bytes(data=image_bytes, mime_type=mime)
     except ValueError as exc:
         logger.warning(f"Failed to convert reference image for Gemini input: {exc}")
     return None
 
 
+@lru_cache(maxsize=4)
+def _decode_reference_image(image_str: str) -> Tuple[bytes, str]:
+    """Decode a base64 data URL into (bytes, mime type).
+    
+    Memoized for the few most recent images: every panel of a package is
+    generated against the same reference mockup.
+    """
+    header, b64_data = image_str.split(",", 1)
+    mime = header.split(";")[0].split(":")[1]
+    return base64.b64decode(b64_data), mime
+
+
 # Initialize service
 gemini_image_service = GeminiImageService()
\ No newline at end of file
@@ -1,13 +1,27 @@
-import fal_client
+import base64
+import binascii
+import functools
+import hashlib
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List
 from typing_extensions import TypedDict
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# generate_3d_asset blocks its thread for the whole fal.ai job (often minutes), so
+# callers run it here rather than on the default executor, where long jobs would
+# hold workers needed by short asyncio.to_thread calls (file writes, texture cache)
+TRELLIS_MAX_WORKERS = 4
+trellis_executor = ThreadPoolExecutor(max_workers=TRELLIS_MAX_WORKERS, thread_name_prefix="trellis")
+
+class TrellisError(Exception):
+    """Trellis generation errors."""
+    pass
+
 class TrellisOutput(TypedDict, total=False):
     """Output schema from Trellis model."""
     model_file: str
@@ -17,6 +31,21 @@ class TrellisOutput(TypedDict, total=False):
     combined_video: str
     no_background_images: List[str]
 
+def _image_identity(url: str) -> str:
+    """Return a SHA256 hex digest identifying an image URL.
+    
+    Base64 data URLs are hashed on their decoded bytes so the same image always
+    maps to the same identity; any other URL is hashed as a string.
+    """
+    if url.startswith("data:image/"):
+        header, _, b64_data = url.partition(",")
+        if header.endswith(";base64"):
+            try:
+                return hashlib.sha256(base64.b64decode(b64_data, validate=False)).hexdigest()
+            except (binascii.Error, ValueError):
+                pass
+    return hashlib.sha256(url.encode()).hexdigest()
+
 class TrellisService:
     def __init__(self):
         self.api_key = settings.FAL_KEY
@@ -27,6 +56,8 @@ class TrellisService:
             logger.info(f"fal.ai API key configured: {self.api_key[:10]}...")
         else:
             logger.warning("No fal.ai API key found in settings")
+        # fal_client (and its httpx/websocket deps) is imported on first use
+        self._fal = None
     
     def generate_3d_asset(
         self,
@@ -70,10 +101,10 @@ class TrellisService:
             logger.info(f"  Images provided: {len(images)}")
             if use_multi:
                 for idx, img in enumerate(images, 1):
-                    logger.info(f"    [{idx}] len={len(img)} preview={img[:100]}...")
+                    logger.info(f"    [{idx}] len={len(img)} sha256={_image_identity(img)[:16]}")
             else:
                 logger.info(f"  Image URL length: {len(images[0])}")
-                logger.info(f"  Image URL preview: {images[0][:100]}...")
+                logger.info(f"  Image sha256: {_image_identity(images[0])[:16]}")
             logger.info(f"  seed: {seed}")
             logger.info(f"  texture_size: {texture_size}")
             logger.info(f"  mesh_simplify: {mesh_simplify}")
@@ -89,6 +120,10 @@ class TrellisService:
             # Track generation time
             start_time = time.time()
             
+            if self._fal is None:
+                import fal_client
+                self._fal = fal_client
+            
             # Submit request and get result using fal_client.subscribe
             # This handles submission, polling, and result retrieval automatically
             arguments = {
@@ -105,7 +140,7 @@ class TrellisService:
                 arguments["image_urls"] = images
                 arguments["multiimage_algo"] = multiimage_algo
             
-            result = fal_client.subscribe(
+            result = self._fal.subscribe(
                 "fal-ai/trellis",
                 arguments=arguments,
                 with_logs=True,
@@ -143,14 +178,18 @@ class TrellisService:
                         logger.info(f"🎯 Model file URL: {output['model_file']}")
             
             if not output:
-                raise Exception(f"No valid output received from fal.ai. Result was: {result}")
+                raise TrellisError(f"No valid output received from fal.ai. Result was: {result}")
             
             logger.info(f"✅ Successfully generated 3D asset in {generation_time:.2f}s: {output}")
             return output
             
+        except TrellisError as e:
+            # Traceback is logged once by the caller at the request boundary
+            logger.error("Trellis failed: %s", e)
+            raise
         except Exception as e:
-            logger.exception(f"Failed to generate 3D asset: {str(e)}")
-            raise Exception(f"Failed to generate 3D asset: {str(e)}")
+            logger.error("Trellis failed: %s", e)
+            raise TrellisError(f"Failed to generate 3D asset: {e}") from e
     
     def _handle_queue_update(self, update):
         """Handle queue status updates and log progress."""
@@ -187,4 +226,7 @@ class TrellisService:
                 message=f"Trellis: {status_msg}"
             )
 
-trellis_service = TrellisService()
+@functools.lru_cache(maxsize=None)
+def get_trellis_service() -> TrellisService:
+    """Return the shared TrellisService, created on first use."""
+    return TrellisService()
@@ -8,6 +8,7 @@ from .product_state import (  # noqa: F401
     clear_product_state,
     get_product_state,
     get_product_status,
+    save_product_snapshot,
     save_product_state,
     save_product_status,
     PRODUCT_STATE_KEY,
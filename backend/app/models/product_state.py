@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import binascii
+import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Literal, Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, Literal, Optional, Tuple
 
+import orjson
 from pydantic import BaseModel, Field
 
 from app.core.redis import redis_service
@@ -10,6 +14,18 @@ from app.core.redis import redis_service
 PRODUCT_STATE_KEY = "product:current"
 PRODUCT_STATUS_KEY = "product_status:current"
 
+# Stored ProductState layout: marker, 4-byte header length, JSON header, raw image bytes.
+# Data-URL images, the bulk of the state, are kept decoded (base64 is a third larger)
+# and stored once even when several iterations reference them. Payloads without the
+# marker are plain JSON from before this format.
+_PACKED_STATE_MARKER = b"\x00"
+_BASE64_SEPARATOR = ";base64,"
+
+logger = logging.getLogger(__name__)
+
+# Called after each status write in this process (see add_status_listener)
+_status_listeners: List[Callable[[], None]] = []
+
 
 def _utcnow() -> datetime:
     """Return a timezone-aware UTC timestamp."""
@@ -102,9 +118,87 @@ class ProductStatus(BaseModel):
         return self.model_dump(mode="json")
 
 
+def _pack_state(state: ProductState) -> bytes:
+    """Serialize state with its data-URL images stored as deduplicated raw bytes."""
+    payload = state.as_json()
+    blobs: List[bytes] = []
+    blob_headers: List[list] = []
+    blob_index: Dict[str, int] = {}
+
+    def pack_images(images: List[str]) -> list:
+        packed = []
+        for image in images:
+            ref = blob_index.get(image)
+            if ref is None:
+                decoded = _decode_data_url(image)
+                if decoded is None:
+                    packed.append(image)
+                    continue
+                ref = blob_index[image] = len(blobs)
+                blob_headers.append([decoded[0], len(decoded[1])])
+                blobs.append(decoded[1])
+            packed.append(ref)
+        return packed
+
+    payload["images"] = pack_images(payload["images"])
+    for iteration in payload["iterations"]:
+        iteration["images"] = pack_images(iteration["images"])
+
+    header = orjson.dumps({"state": payload, "blobs": blob_headers})
+    return b"".join([_PACKED_STATE_MARKER, len(header).to_bytes(4, "big"), header, *blobs])
+
+
+@lru_cache(maxsize=8)  # Each entry pins a data URL and its bytes (a few MB)
+def _decode_data_url(image: str) -> Optional[Tuple[str, bytes]]:
+    """Split a base64 data URL into (prefix, raw bytes), or None if it can't be packed.
+
+    Memoized: a flow saves the same images several times (and every iteration
+    repeats them), so each image is decoded once rather than on every save.
+    """
+    prefix, separator, data = image.partition(_BASE64_SEPARATOR)
+    if not separator or not prefix.startswith("data:"):
+        return None
+    try:
+        raw = binascii.a2b_base64(data)
+    except ValueError:  # Not valid base64
+        return None
+    # Only pack images that re-encode to the exact same string
+    if binascii.b2a_base64(raw, newline=False) != data.encode("ascii", "replace"):
+        return None
+    return prefix + separator, raw
+
+
+def _unpack_state(raw: bytes) -> dict:
+    """Inverse of _pack_state; returns the state as a JSON dict with data URLs restored."""
+    header_end = 5 + int.from_bytes(raw[1:5], "big")
+    header = orjson.loads(memoryview(raw)[5:header_end])
+    blob_data = memoryview(raw)[header_end:]
+    urls = []
+    offset = 0
+    for prefix, size in header["blobs"]:
+        urls.append(prefix + binascii.b2a_base64(blob_data[offset:offset + size], newline=False).decode("ascii"))
+        offset += size
+
+    def unpack_images(images: list) -> List[str]:
+        return [urls[image] if isinstance(image, int) else image for image in images]
+
+    payload = header["state"]
+    payload["images"] = unpack_images(payload["images"])
+    for iteration in payload["iterations"]:
+        iteration["images"] = unpack_images(iteration["images"])
+    return payload
+
+
 def get_product_state() -> ProductState:
     """Fetch the current session state from Redis or return a default object."""
-    payload = redis_service.get_json(PRODUCT_STATE_KEY)
+    raw = redis_service.get_bytes(PRODUCT_STATE_KEY)
+    if not raw:
+        return ProductState()
+    try:
+        payload = _unpack_state(raw) if raw.startswith(_PACKED_STATE_MARKER) else orjson.loads(raw)
+    except (ValueError, KeyError, IndexError):
+        logger.warning("Failed to decode stored product state")
+        return ProductState()
     if not payload:
         return ProductState()
     return ProductState.model_validate(payload)
@@ -113,7 +207,7 @@ def get_product_state() -> ProductState:
 def save_product_state(state: ProductState) -> None:
     """Persist the session state back to Redis."""
     state.updated_at = _utcnow()
-    redis_service.set_json(PRODUCT_STATE_KEY, state.as_json())
+    redis_service.set(PRODUCT_STATE_KEY, _pack_state(state))
 
 
 def clear_product_state() -> ProductState:
@@ -131,7 +225,39 @@ def get_product_status() -> ProductStatus:
 
 
 def save_product_status(status: ProductStatus) -> None:
+    """Persist the status payload.
+
+    Always writes: repeated updates within a pipeline flow are dropped by
+    ProductPipelineService._update_status, which knows what that flow last wrote.
+    """
     status.updated_at = _utcnow()
     redis_service.set_json(PRODUCT_STATUS_KEY, status.as_json())
+    _notify_status_listeners()
+
+
+def save_product_snapshot(state: ProductState, status: ProductStatus) -> None:
+    """Persist the session state and status payload in a single Redis round-trip."""
+    now = _utcnow()
+    state.updated_at = now
+    status.updated_at = now
+    redis_service.save_many(
+        [
+            (PRODUCT_STATE_KEY, _pack_state(state)),
+            (PRODUCT_STATUS_KEY, status.as_json()),
+        ]
+    )
+    _notify_status_listeners()
+
+
+def add_status_listener(listener: Callable[[], None]) -> Callable[[], None]:
+    """Register a callback run after every status write; returns its remover.
+
+    Listeners run on the writing thread and must not block.
+    """
+    _status_listeners.append(listener)
+    return lambda: _status_listeners.remove(listener)
 
 
+def _notify_status_listeners() -> None:
+    for listener in tuple(_status_listeners):
+        listener()
@@ -1,14 +1,15 @@
 """Service layer helpers."""
 
-# Make product_pipeline optional since it requires dependencies
-try:
-    from .product_pipeline import ProductPipelineService, product_pipeline_service  # noqa: F401
-except ImportError:
-    pass  # Product pipeline not available
-
-
-
-
-
-
-
+_PIPELINE_EXPORTS = ("ProductPipelineService", "product_pipeline_service")
+
+
+def __getattr__(name):
+    # Import product_pipeline on first use: it pulls in the Gemini/Trellis clients,
+    # which lighter submodules (e.g. texture_cache) shouldn't pay for at import time
+    if name in _PIPELINE_EXPORTS:
+        try:
+            from . import product_pipeline
+        except ImportError as exc:  # Product pipeline not available
+            raise AttributeError(name) from exc
+        return getattr(product_pipeline, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
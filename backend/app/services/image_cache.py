@@ -0,0 +1,76 @@
+"""Disk-backed cache of generated product views.
+
+A create/edit request identical to an earlier one (same prompt, workflow,
+reference images, base description and view count) reuses the earlier views
+instead of calling Gemini again. Views are stored one PNG per view in the
+texture cache format. Opt-in via CACHE_PRODUCT_IMAGES: outside of development,
+re-running a prompt is expected to produce new variants.
+"""
+import hashlib
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+from app.services.texture_cache import TextureCache
+
+PRODUCT_IMAGE_CACHE_DIR = Path(__file__).resolve().parents[2] / "image_cache"
+PRODUCT_IMAGE_CACHE_MAX_BYTES = 1024 ** 3  # 1GB
+
+
+def product_images_key(
+    prompt: str,
+    workflow: str,
+    image_count: int,
+    reference_images: Optional[List[str]] = None,
+    base_description: Optional[str] = None,
+) -> Optional[str]:
+    """Hash everything that determines a set of generated views.
+
+    Returns None when a reference image is a remote URL, whose content can
+    change behind the same string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        prompt,
+        workflow,
+        str(image_count),
+        base_description or "",
+        settings.GEMINI_PRO_MODEL,
+        settings.GEMINI_FLASH_MODEL,
+        settings.GEMINI_IMAGE_SIZE or "",
+        settings.GEMINI_IMAGE_ASPECT_RATIO or "",
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    for image in reference_images or ():
+        if not image.startswith("data:"):
+            return None
+        digest.update(hashlib.sha256(image.encode()).digest())
+    return digest.hexdigest()
+
+
+class ProductImageCache:
+    """Stores each request's views as <key>_<n>.png entries of a TextureCache.
+
+    Methods do blocking file I/O; call them via asyncio.to_thread.
+    """
+
+    def __init__(self, cache_dir: Path = PRODUCT_IMAGE_CACHE_DIR, max_bytes: int = PRODUCT_IMAGE_CACHE_MAX_BYTES):
+        self._store = TextureCache(cache_dir=cache_dir, max_bytes=max_bytes)
+
+    def get(self, key: str, image_count: int) -> Optional[List[str]]:
+        """Return all cached views for key, or None if any is missing."""
+        views = []
+        for idx in range(image_count):
+            view = self._store.get(f"{key}_{idx}")
+            if view is None:
+                return None  # Partly evicted; regenerate the whole set
+            views.append(view)
+        return views
+
+    def put(self, key: str, images: List[str]) -> None:
+        for idx, image in enumerate(images):
+            self._store.put(f"{key}_{idx}", image)
+
+
+product_image_cache = ProductImageCache()
@@ -1,24 +1,98 @@
 import asyncio
 import logging
-from typing import Optional
+import math
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from app.integrations.gemini import gemini_image_service, GeminiError
+from app.core.config import settings
+from app.integrations.gemini import gemini_image_service, GeminiError, QuotaExceededError
 from app.models.packaging_state import (
     PackagingState,
     PanelTexture,
     get_packaging_state,
     save_packaging_state,
 )
-from app.services.panel_prompt_templates import panel_prompt_builder
+from app.services.panel_prompt_templates import panel_metrics, panel_prompt_builder
+from app.services.texture_cache import texture_cache, texture_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Gemini image quota is 30 RPM / 1M TPM; stay at 80% of both to avoid 429s
+GEMINI_MAX_CONCURRENT_REQUESTS = 5
+GEMINI_REQUESTS_PER_MINUTE = 24
+GEMINI_TOKENS_PER_MINUTE = 800_000
+GEMINI_QUOTA_RETRIES = 2
+GEMINI_DEFAULT_RETRY_AFTER = 10.0  # Seconds, when a 429 carries no Retry-After
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        # Buckets are module-level, but on Python 3.9 an asyncio.Lock binds to the
+        # loop it is first used on; keep one lock per running loop instead
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until ``amount`` tokens are available, then consume them."""
+        amount = min(amount, self.capacity)
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+_request_limiter = TokenBucket(rate=GEMINI_REQUESTS_PER_MINUTE / 60, capacity=GEMINI_REQUESTS_PER_MINUTE)
+_token_limiter = TokenBucket(rate=GEMINI_TOKENS_PER_MINUTE / 60, capacity=GEMINI_TOKENS_PER_MINUTE)
+
 
 class PanelGenerationService:
     """Service for generating panel textures using Gemini."""
     
     def __init__(self):
         self.gemini_service = gemini_image_service
+        # Caps concurrent Gemini panel calls; created lazily, once per running loop
+        self._gemini_semaphore: Optional[asyncio.Semaphore] = None
+        self._gemini_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Texture cache key -> running generation, shared by identical concurrent requests
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Running generation -> callers still awaiting it; cancelled once none are left
+        self._inflight_waiters: Dict[asyncio.Task, int] = {}
+        self._warm_prompt_caches()
+    
+    def _warm_prompt_caches(self) -> None:
+        """Pre-compute panel metrics (aspect ratio, size, orientation) for the default layouts.
+        
+        Most sessions keep the default box/cylinder dimensions, so their panels
+        hit the memoized helpers from the first request. Panel sizes mirror
+        how the editor lays out each face.
+        """
+        defaults = PackagingState()
+        box = defaults.box_state.dimensions
+        cylinder = defaults.cylinder_state.dimensions
+        panel_sizes = [
+            (box["width"], box["height"]),  # front / back
+            (box["depth"], box["height"]),  # left / right
+            (box["width"], box["depth"]),  # top / bottom
+            (math.pi * cylinder["width"], cylinder["height"]),  # body (circumference)
+            (cylinder["width"], cylinder["width"]),  # top / bottom caps
+        ]
+        for width, height in panel_sizes:
+            panel_metrics(width, height)
     
     async def generate_panel_texture(
         self,
@@ -45,7 +119,9 @@ class PanelGenerationService:
             Base64-encoded image data URL or None if generation fails
         """
         try:
-            # Validate and build structured prompt with guardrails
+            # Validate and build structured prompt with guardrails.
+            # Built inline on the event loop on purpose: the builders are memoized
+            # (~1us hit, ~7us miss), far cheaper than an asyncio.to_thread hop (~45us).
             enhanced_prompt = self._build_structured_prompt(
                 panel_id=panel_id,
                 user_prompt=prompt,
@@ -55,9 +131,12 @@ class PanelGenerationService:
                 has_reference=bool(reference_mockup),
             )
             
-            logger.info(f"[panel-gen] Generating texture for panel {panel_id}")
-            logger.info(f"[panel-gen] User prompt: {prompt[:100]}...")
-            logger.info(f"[panel-gen] Using structured prompt template: {'WITH' if reference_mockup else 'WITHOUT'} reference mockup")
+            logger.info("[panel-gen] Generating texture for panel %s", panel_id)
+            logger.info("[panel-gen] User prompt: %.100s...", prompt)
+            logger.info(
+                "[panel-gen] Using structured prompt template: %s reference mockup",
+                "WITH" if reference_mockup else "WITHOUT",
+            )
             
             # Prepare reference images
             # Priority: old_texture_url (for iteration) > reference_mockup (user upload)
@@ -68,33 +147,177 @@ class PanelGenerationService:
             else:
                 reference_images = None
             
-            # Use Gemini with appropriate workflow
-            images = await self.gemini_service.generate_product_images(
-                prompt=enhanced_prompt,
-                workflow=workflow,  # "create" or "edit"
-                image_count=1,
-                reference_images=reference_images,
-                is_texture=True,
-            )
+            # Concurrent identical requests (double-clicks, reconnects) share one generation
+            cache_key = texture_cache_key(enhanced_prompt, workflow, reference_images)
+            task = self._inflight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(
+                    self._generate_or_load(cache_key, enhanced_prompt, workflow, reference_images)
+                )
+                self._inflight[cache_key] = task
+                task.add_done_callback(lambda done: self._forget_inflight(cache_key, done))
+            else:
+                logger.info("[panel-gen] Joining in-flight generation for panel %s", panel_id)
             
-            if images and len(images) > 0:
-                logger.info(f"[panel-gen] Successfully generated texture for panel {panel_id}")
-                return images[0]
+            # Shielded so one caller cancelling doesn't cancel the others' result
+            self._inflight_waiters[task] = self._inflight_waiters.get(task, 0) + 1
+            try:
+                texture_url = await asyncio.shield(task)
+            finally:
+                waiters = self._inflight_waiters.pop(task) - 1
+                if waiters:
+                    self._inflight_waiters[task] = waiters
+                elif not task.done():
+                    # Every caller was cancelled - stop the Gemini call instead of spending quota on it
+                    task.cancel()
+            
+            if texture_url:
+                logger.info("[panel-gen] Successfully generated texture for panel %s", panel_id)
+                return texture_url
             else:
-                logger.warning(f"[panel-gen] No image returned for panel {panel_id}")
+                logger.warning("[panel-gen] No image returned for panel %s", panel_id)
                 return None
                 
         except ValueError as e:
             # Prompt validation errors
-            logger.error(f"[panel-gen] Prompt validation error for panel {panel_id}: {e}")
+            logger.error("[panel-gen] Prompt validation error for panel %s: %s", panel_id, e)
             raise
         except GeminiError as e:
-            logger.error(f"[panel-gen] Gemini error generating panel {panel_id}: {e}")
+            logger.error("[panel-gen] Gemini error generating panel %s: %s", panel_id, e)
             raise
         except Exception as e:
-            logger.error(f"[panel-gen] Unexpected error generating panel {panel_id}: {e}", exc_info=True)
+            logger.error("[panel-gen] Unexpected error generating panel %s: %s", panel_id, e, exc_info=True)
             raise
     
+    def _forget_inflight(self, cache_key: str, task: asyncio.Task) -> None:
+        """Done-callback for a shared generation: drop it from the in-flight map."""
+        if self._inflight.get(cache_key) is task:
+            self._inflight.pop(cache_key)
+        if not task.cancelled():
+            # Mark the failure retrieved; callers still awaiting it re-raise it themselves
+            task.exception()
+    
+    async def generate_panel_textures_batch(
+        self,
+        panel_specs: List[dict],
+        on_panel_done: Optional[Callable[[str, Optional[str]], None]] = None,
+    ) -> Dict[str, Optional[str]]:
+        """Generate textures for several panels of one package in a single call.
+        
+        Gemini image models return one image per request and each panel needs
+        its own prompt, so every panel is still its own API call. The calls
+        are fanned out together (see generate_panels_streaming) and paced by
+        the shared limits in _call_gemini.
+        
+        Args:
+            panel_specs: Keyword arguments for generate_panel_texture, one dict per panel
+            on_panel_done: Optional callback invoked with (panel_id, texture_url) as each panel finishes
+            
+        Returns:
+            Map of panel_id to texture data URL (None for panels that failed)
+        """
+        results: Dict[str, Optional[str]] = {}
+        async for panel_id, texture_url in self.generate_panels_streaming(panel_specs):
+            if on_panel_done:
+                on_panel_done(panel_id, texture_url)
+            results[panel_id] = texture_url
+        return {spec["panel_id"]: results[spec["panel_id"]] for spec in panel_specs}
+    
+    async def generate_panels_streaming(
+        self,
+        panel_specs: List[dict],
+    ) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """Yield (panel_id, texture_url) pairs as soon as each panel finishes.
+        
+        Lets callers surface the first textures without waiting for the slowest
+        panel. texture_url is None for panels that failed.
+        """
+        tasks = [asyncio.ensure_future(self._generate_isolated(spec)) for spec in panel_specs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early - cancelling the last waiter on a panel cancels its Gemini call
+            for task in tasks:
+                task.cancel()
+    
+    async def _generate_isolated(self, spec: dict) -> Tuple[str, Optional[str]]:
+        """Run generate_panel_texture for one spec, turning failures into None."""
+        panel_id = spec["panel_id"]
+        try:
+            return panel_id, await self.generate_panel_texture(**spec)
+        except Exception as e:
+            # One failed panel must not abort the rest of the batch
+            logger.error("[panel-gen] Error generating panel %s in batch: %s", panel_id, e)
+            return panel_id, None
+    
+    async def _generate_or_load(
+        self,
+        cache_key: str,
+        enhanced_prompt: str,
+        workflow: str,
+        reference_images: Optional[List[str]],
+    ) -> Optional[str]:
+        """Generate the texture for cache_key, via the texture cache when enabled.
+        
+        The cache is opt-in (CACHE_PANEL_TEXTURES): with it on, regenerating a
+        panel with the same prompt returns the same texture instead of a new
+        variant.
+        """
+        use_cache = settings.CACHE_PANEL_TEXTURES
+        if use_cache:
+            cached_texture = await asyncio.to_thread(texture_cache.get, cache_key)
+            if cached_texture:
+                logger.info("[panel-gen] Texture cache hit (%s)", cache_key)
+                return cached_texture
+        
+        # Use Gemini with appropriate workflow
+        images = await self._call_gemini(enhanced_prompt, workflow, reference_images)
+        if not images:
+            return None
+        if use_cache:
+            await asyncio.to_thread(texture_cache.put, cache_key, images[0])
+        return images[0]
+    
+    async def _call_gemini(
+        self,
+        enhanced_prompt: str,
+        workflow: str,
+        reference_images: Optional[List[str]],
+    ) -> List[str]:
+        """Call Gemini within the shared concurrency cap and rate limits, backing off on 429s."""
+        loop = asyncio.get_running_loop()
+        if self._gemini_semaphore is None or self._gemini_semaphore_loop is not loop:
+            self._gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENT_REQUESTS)
+            self._gemini_semaphore_loop = loop
+        
+        attempt = 0
+        while True:
+            async with self._gemini_semaphore:
+                await _request_limiter.acquire()
+                await _token_limiter.acquire(len(enhanced_prompt) // 4)  # ~4 chars per token
+                try:
+                    return await self.gemini_service.generate_product_images(
+                        prompt=enhanced_prompt,
+                        workflow=workflow,  # "create" or "edit"
+                        image_count=1,
+                        reference_images=reference_images,
+                        is_texture=True,
+                        raise_on_quota=True,  # Backed off and retried below
+                    )
+                except QuotaExceededError as e:
+                    if attempt >= GEMINI_QUOTA_RETRIES:
+                        raise
+                    delay = e.retry_after or GEMINI_DEFAULT_RETRY_AFTER
+            
+            # Back off outside the semaphore so other panels can proceed
+            attempt += 1
+            logger.warning(
+                "[panel-gen] Gemini quota exceeded, retrying in %.1fs (attempt %d/%d)",
+                delay, attempt, GEMINI_QUOTA_RETRIES,
+            )
+            await asyncio.sleep(delay)
+    
     def _build_structured_prompt(
         self,
         panel_id: str,
@@ -121,7 +344,7 @@ class PanelGenerationService:
             raise ValueError(f"Invalid panel dimensions: {panel_width}mm × {panel_height}mm")
         
         if box_width <= 0 or box_height <= 0 or box_depth <= 0:
-            logger.warning(f"[panel-gen] Invalid box dimensions, using panel dimensions as fallback")
+            logger.warning("[panel-gen] Invalid box dimensions, using panel dimensions as fallback")
             # Fallback to simple prompt if box dimensions are invalid
             return panel_prompt_builder.build_simple_prompt(
                 face_name=panel_id,
@@ -152,7 +375,7 @@ class PanelGenerationService:
                 )
             return prompt
         except ValueError as e:
-            logger.error(f"[panel-gen] Prompt validation failed: {e}")
+            logger.error("[panel-gen] Prompt validation failed: %s", e)
             raise ValueError(f"Your prompt needs improvement: {e}")
     
     def _get_panel_context(self, panel_id: str, package_type: str) -> str:
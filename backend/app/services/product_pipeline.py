@@ -1,20 +1,25 @@
 from __future__ import annotations
 
 import asyncio
-import base64
+import binascii
+import functools
+import importlib.util
+import itertools
 import logging
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-# Make trellis optional - only needed for product generation
-try:
-    from app.integrations.trellis import trellis_service
-    TRELLIS_AVAILABLE = True
-except ImportError:
-    trellis_service = None
-    TRELLIS_AVAILABLE = False
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+import orjson
+from pydantic import TypeAdapter
+
+from app.integrations.trellis import get_trellis_service, trellis_executor
+
+# Trellis is optional - fal_client is only imported when a model is generated
+TRELLIS_AVAILABLE = importlib.util.find_spec("fal_client") is not None
 from app.integrations.gemini import gemini_image_service
+from app.services.image_cache import product_image_cache, product_images_key
 from app.models.product_state import (
     ProductIteration,
     ProductState,
@@ -33,6 +38,82 @@ logger = logging.getLogger(__name__)
 ARTIFACTS_DIR = Path(__file__).parent.parent.parent / "tests" / "artifacts"
 ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Trellis artifact downloads (GLB, videos, no-bg images) run concurrently
+ARTIFACT_DOWNLOAD_CONCURRENCY = 8
+ARTIFACT_DOWNLOAD_TIMEOUT = 60.0  # Seconds
+ARTIFACT_KEEPALIVE_EXPIRY = 60.0  # Seconds; httpx defaults to 5
+# HTTP/2 lets concurrent downloads from the same CDN share one connection (needs h2)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Shared across flows so downloads reuse pooled connections; created on first use
+# and closed by the app lifespan on shutdown
+_artifact_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_artifact_client() -> httpx.AsyncClient:
+    global _artifact_client
+    if _artifact_client is None or _artifact_client.is_closed:
+        _artifact_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=ARTIFACT_DOWNLOAD_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=ARTIFACT_DOWNLOAD_CONCURRENCY,
+                max_keepalive_connections=ARTIFACT_DOWNLOAD_CONCURRENCY,
+                keepalive_expiry=ARTIFACT_KEEPALIVE_EXPIRY,
+            ),
+            follow_redirects=True,
+        )
+    return _artifact_client
+
+
+async def close_artifact_client() -> None:
+    """Close the shared download client and its pooled connections."""
+    global _artifact_client
+    if _artifact_client is not None:
+        await _artifact_client.aclose()
+        _artifact_client = None
+
+_PNG_DATA_URL_PREFIX = "data:image/png;base64,"
+
+# Validator built once for the Trellis output of every flow. For this small dict it
+# beats TrellisArtifacts.model_validate, and even model_construct(**output)
+_TRELLIS_ARTIFACTS = TypeAdapter(TrellisArtifacts)
+
+# Status updates within this window are coalesced into one Redis write
+STATUS_FLUSH_DELAY = 0.1  # Seconds
+_TERMINAL_STATUSES = frozenset({"complete", "error"})
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-run
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _run_in_background(coro) -> asyncio.Task:
+    """Schedule a coroutine off the request's critical path."""
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+# Iteration ids must stay unique across restarts (the frontend caches models by id),
+# so they keep a wall-clock prefix; the counter disambiguates flows in the same millisecond.
+_iteration_counter = itertools.count(1)
+
+
+def _run_stamp() -> int:
+    """Millisecond timestamp read once per flow and shared by the run dir and iteration id."""
+    return time.time_ns() // 1_000_000
+
+
+def _status_unchanged(current: ProductStatus, update: ProductStatus) -> bool:
+    """Whether merging `update` into `current` (see _update_status) would be a no-op."""
+    return (
+        (update.status, update.progress, update.message, update.error)
+        == (current.status, current.progress, current.message, current.error)
+        and (not update.model_file or update.model_file == current.model_file)
+        and (not update.preview_image or update.preview_image == current.preview_image)
+    )
+
 
 class ProductPipelineService:
     """Runs the create/edit pipeline for the single in-memory product session."""
@@ -40,6 +121,13 @@ class ProductPipelineService:
     def __init__(self) -> None:
         self._default_image_count = 1
         # Model selection delegated to GeminiImageService based on workflow
+        # Latest status not yet written to Redis, and the timer that will write it
+        self._pending_status: Optional[ProductStatus] = None
+        self._status_flush_handle: Optional[asyncio.TimerHandle] = None
+        # Last status this flow wrote, used to drop repeated updates before touching Redis
+        self._last_status: Optional[ProductStatus] = None
+        # Mid-flow state write still running on a worker thread (see _save_state_behind)
+        self._state_write: Optional[asyncio.Future] = None
 
     async def run_create(self, prompt: str, image_count: Optional[int] = None) -> None:
         """Execute the create pipeline end-to-end."""
@@ -79,11 +167,14 @@ class ProductPipelineService:
         """
         logger.info(f"[product-pipeline] Starting Trellis-only flow with {len(images)} pre-generated images")
         flow_started_at = time.perf_counter()
+        run_stamp = _run_stamp()
+        self._last_status = None  # Status may have been changed elsewhere since the last flow
         
         state = get_product_state()
         
         try:
-            # Set up state
+            # Set up state. Not persisted yet: the /trellis-only route already saved
+            # these fields and the images, and the progress mark goes out as status.
             if mode == "create":
                 state.prompt = prompt
                 state.iterations = []
@@ -94,7 +185,6 @@ class ProductPipelineService:
             state.in_progress = True
             state.images = images  # Use pre-provided images
             state.mark_progress("generating_model", "Generating 3D model with Trellis (using pre-generated images)")
-            save_product_state(state)
             
             self._update_status(
                 ProductStatus(
@@ -104,16 +194,18 @@ class ProductPipelineService:
                 )
             )
             
-            # Save pre-generated images to artifacts if enabled
-            if settings.SAVE_ARTIFACTS_LOCALLY:
-                self._save_gemini_images(images, f"{mode}_pregenerated")
+            # Save pre-generated images to artifacts if enabled (alongside Trellis)
+            # All debug artifacts of this run share one directory
+            run_dir = self._create_run_dir(f"{mode}_pregenerated", run_stamp) if settings.SAVE_ARTIFACTS_LOCALLY else None
+            if run_dir:
+                _run_in_background(self._save_gemini_images(images, run_dir))
             
             # Run Trellis
             trellis_output = await self._generate_trellis_model(images)
-            artifacts = TrellisArtifacts.model_validate(trellis_output)
+            artifacts = _TRELLIS_ARTIFACTS.validate_python(trellis_output)
             
             duration_seconds = round(time.perf_counter() - flow_started_at, 2)
-            iteration_id = f"iter_{int(time.time() * 1000)}"
+            iteration_id = f"iter_{run_stamp}_{next(_iteration_counter)}"
             iteration = ProductIteration(
                 id=iteration_id,
                 type=mode,
@@ -127,12 +219,7 @@ class ProductPipelineService:
             state.trellis_output = artifacts
             state.iterations.append(iteration)
             state.mark_complete("3D asset generated from pre-generated images")
-            save_product_state(state)
-            
-            # Save artifacts
-            if settings.SAVE_ARTIFACTS_LOCALLY:
-                self._save_trellis_model(artifacts, mode)
-                self._save_product_state(state, mode)
+            await self._save_state(state)
             
             preview = self._determine_preview_image(state)
             self._update_status(
@@ -145,12 +232,16 @@ class ProductPipelineService:
                 )
             )
             
+            # Save artifacts after reporting completion; debug-only side effect
+            if run_dir:
+                _run_in_background(self._save_artifacts(state, artifacts, run_dir))
+            
             logger.info(f"[product-pipeline] Trellis-only flow complete in {duration_seconds}s")
             
         except Exception as exc:
             logger.exception("Trellis-only pipeline failed: %s", exc)
             state.mark_error(str(exc))
-            save_product_state(state)
+            await self._save_state(state)
             self._update_status(
                 ProductStatus(
                     status="error",
@@ -162,10 +253,15 @@ class ProductPipelineService:
 
     async def _execute_flow(self, state: ProductState, instruction: str, mode: str) -> None:
         flow_started_at = time.perf_counter()
+        run_stamp = _run_stamp()
+        self._last_status = None  # Status may have been changed elsewhere since the last flow
+        trellis_task: Optional[asyncio.Task] = None
         try:
+            # Not persisted yet: the router already saved in_progress, and the
+            # progress mark travels in the status payload. The next state write
+            # is when images arrive.
             state.in_progress = True
             state.mark_progress("generating_images", "Generating concept images")
-            save_product_state(state)
             self._update_status(
                 ProductStatus(
                     status="generating_images",
@@ -175,36 +271,41 @@ class ProductPipelineService:
             )
 
             reference_images = state.images if mode == "edit" else None
-            images = await gemini_image_service.generate_product_images(
+            image_count = state.image_count or self._default_image_count
+            # Without multi-image mode Trellis only uses the first view, so it can
+            # start on that view while Gemini renders the remaining angles
+            start_trellis_early = not (settings.TRELLIS_ENABLE_MULTI_IMAGE and image_count > 1)
+            images: List[str] = []
+            async for image in self._iter_product_views(
                 prompt=instruction,
                 workflow=mode,  # "create" or "edit" - determines model selection
-                image_count=state.image_count or self._default_image_count,
+                image_count=image_count,
                 reference_images=reference_images,
                 base_description=state.prompt,
-            )
+            ):
+                images.append(image)
+                if start_trellis_early and trellis_task is None:
+                    trellis_task = self._start_trellis(images[:1])
             if not images:
                 raise RuntimeError("Gemini image pipeline returned no images")
+            # Store the whole batch and the next progress mark in a single write
             state.images = images
-            save_product_state(state)
-            
-            # Save Gemini images to artifacts for inspection (test mode only)
-            if settings.SAVE_ARTIFACTS_LOCALLY:
-                self._save_gemini_images(images, mode)
-
             state.mark_progress("generating_model", "Generating 3D model with Trellis")
-            save_product_state(state)
-            self._update_status(
-                ProductStatus(
-                    status="generating_model",
-                    progress=45,
-                    message="Generating 3D model with Trellis",
-                )
-            )
+            self._save_state_behind(state)
+            
+            # Save Gemini images to artifacts for inspection (test mode only),
+            # on worker threads while Trellis runs
+            run_dir = self._create_run_dir(mode, run_stamp) if settings.SAVE_ARTIFACTS_LOCALLY else None
+            if run_dir:
+                _run_in_background(self._save_gemini_images(images, run_dir))
 
-            trellis_output = await self._generate_trellis_model(images)
-            artifacts = TrellisArtifacts.model_validate(trellis_output)
+            if trellis_task is None:
+                trellis_task = self._start_trellis(images)
+            trellis_output = await trellis_task
+            await self._wait_for_state_write()  # It serializes state, which is mutated below
+            artifacts = _TRELLIS_ARTIFACTS.validate_python(trellis_output)
             duration_seconds = round(time.perf_counter() - flow_started_at, 2)
-            iteration_id = f"iter_{int(time.time() * 1000)}"
+            iteration_id = f"iter_{run_stamp}_{next(_iteration_counter)}"
             iteration = ProductIteration(
                 id=iteration_id,
                 type=mode,
@@ -216,12 +317,7 @@ class ProductPipelineService:
             state.trellis_output = artifacts
             state.iterations.append(iteration)
             state.mark_complete("3D asset generated")
-            save_product_state(state)
-            
-            # Save Trellis artifacts and state to filesystem (test/demo mode only)
-            if settings.SAVE_ARTIFACTS_LOCALLY:
-                self._save_trellis_model(artifacts, mode)
-                self._save_product_state(state, mode)
+            await self._save_state(state)
 
             preview = self._determine_preview_image(state)
             self._update_status(
@@ -233,11 +329,22 @@ class ProductPipelineService:
                     preview_image=preview,
                 )
             )
+            
+            # Save Trellis artifacts and state to filesystem (test/demo mode only),
+            # in the background so users don't wait on downloads
+            if run_dir:
+                _run_in_background(self._save_artifacts(state, artifacts, run_dir))
             logger.info("[product-pipeline] %s flow complete", mode)
         except Exception as exc:
+            if trellis_task is not None and not trellis_task.done():
+                # Gemini failed after Trellis started on the first view; stop
+                # relaying Trellis progress before reporting the error
+                trellis_task.cancel()
+                await asyncio.wait([trellis_task])
             logger.exception("Product pipeline failed: %s", exc)
+            await self._wait_for_state_write()
             state.mark_error(str(exc))
-            save_product_state(state)
+            await self._save_state(state)
             self._update_status(
                 ProductStatus(
                     status="error",
@@ -247,24 +354,82 @@ class ProductPipelineService:
                 )
             )
 
+    async def _iter_product_views(
+        self,
+        prompt: str,
+        workflow: str,
+        image_count: int,
+        reference_images: Optional[List[str]],
+        base_description: Optional[str],
+    ) -> AsyncIterator[str]:
+        """Yield Gemini views, served from the product image cache when enabled."""
+        key = (
+            product_images_key(prompt, workflow, image_count, reference_images, base_description)
+            if settings.CACHE_PRODUCT_IMAGES
+            else None
+        )
+        if key:
+            cached = await asyncio.to_thread(product_image_cache.get, key, image_count)
+            if cached:
+                logger.info("[product-pipeline] Reusing %d cached Gemini views", len(cached))
+                for image in cached:
+                    yield image
+                return
+
+        images = []
+        async for image in gemini_image_service.generate_product_images_iter(
+            prompt=prompt,
+            workflow=workflow,
+            image_count=image_count,
+            reference_images=reference_images,
+            base_description=base_description,
+        ):
+            images.append(image)
+            yield image
+        if key and len(images) == image_count:  # Partial sets are never cached
+            await asyncio.to_thread(product_image_cache.put, key, images)
+
+    def _start_trellis(self, images: List[str]) -> asyncio.Task:
+        """Report the model-generation phase and start Trellis on images."""
+        self._update_status(
+            ProductStatus(
+                status="generating_model",
+                progress=45,
+                message="Generating 3D model with Trellis",
+            )
+        )
+        return asyncio.ensure_future(self._generate_trellis_model(images))
+
     async def _generate_trellis_model(
         self,
         images: List[str],
         multi_image: Optional[bool] = None,
         multi_image_algo: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Call Trellis via the existing integration in a background thread."""
-        if not TRELLIS_AVAILABLE or not trellis_service:
+        """Call Trellis via the existing integration on the dedicated Trellis executor."""
+        if not TRELLIS_AVAILABLE:
             raise RuntimeError("Trellis service is not available. Please install fal_client dependency.")
         
+        loop = asyncio.get_running_loop()
+        cancelled = False
+
+        def report_progress(status: ProductStatus) -> None:
+            # The Trellis thread outlives a cancelled call; drop its late updates
+            if not cancelled:
+                self._update_status(status)
+
         def progress_callback(status: str, progress: int, message: str):
-            """Update ProductStatus with Trellis progress in real-time."""
-            self._update_status(
+            """Update ProductStatus with Trellis progress in real-time.
+            
+            Called from the Trellis worker thread, so hand the update to the loop.
+            """
+            loop.call_soon_threadsafe(
+                report_progress,
                 ProductStatus(
                     status=status,
                     progress=progress,
                     message=message
-                )
+                ),
             )
         
         use_multi = (
@@ -274,13 +439,20 @@ class ProductPipelineService:
         )
         algo = multi_image_algo or settings.TRELLIS_MULTIIMAGE_ALGO
 
-        return await asyncio.to_thread(
-            trellis_service.generate_3d_asset,
-            images=images,
-            progress_callback=progress_callback,
-            use_multi_image=use_multi,
-            multiimage_algo=algo,
-        )
+        try:
+            return await loop.run_in_executor(
+                trellis_executor,
+                functools.partial(
+                    get_trellis_service().generate_3d_asset,
+                    images=images,
+                    progress_callback=progress_callback,
+                    use_multi_image=use_multi,
+                    multiimage_algo=algo,
+                ),
+            )
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
 
     def _determine_preview_image(self, state: ProductState) -> Optional[str]:
         if state.trellis_output and state.trellis_output.no_background_images:
@@ -290,8 +462,20 @@ class ProductPipelineService:
         return None
 
     def _update_status(self, status: ProductStatus) -> None:
-        """Persist the lightweight status payload."""
-        payload = get_product_status()
+        """Persist the lightweight status payload.
+        
+        Bursts of updates (e.g. Trellis progress polling) are coalesced into at
+        most one write per STATUS_FLUSH_DELAY; terminal statuses are written
+        immediately. Updates that would not change the current payload are
+        dropped, and Redis is read at most once per flow.
+        """
+        current = self._pending_status or self._last_status
+        if current is not None and _status_unchanged(current, status):
+            return
+        # Only a flow's first update reads Redis; later ones build on what this flow wrote
+        payload = self._pending_status or (
+            self._last_status.model_copy() if self._last_status is not None else get_product_status()
+        )
         payload.status = status.status
         payload.progress = status.progress
         payload.message = status.message
@@ -299,61 +483,116 @@ class ProductPipelineService:
         payload.model_file = status.model_file or payload.model_file
         payload.preview_image = status.preview_image or payload.preview_image
         payload.updated_at = status.updated_at
-        save_product_status(payload)
+        self._pending_status = payload
+        
+        if status.status in _TERMINAL_STATUSES:
+            self._flush_status()
+        elif self._status_flush_handle is None:
+            self._status_flush_handle = asyncio.get_running_loop().call_later(
+                STATUS_FLUSH_DELAY, self._flush_status
+            )
+
+    def _flush_status(self) -> None:
+        """Write the pending status, if any, to Redis."""
+        if self._status_flush_handle is not None:
+            self._status_flush_handle.cancel()
+            self._status_flush_handle = None
+        if self._pending_status is not None:
+            save_product_status(self._pending_status)
+            self._last_status = self._pending_status
+            self._pending_status = None
+
+    def _save_state_behind(self, state: ProductState) -> None:
+        """Persist a mid-flow state on a worker thread without holding up the flow.
+
+        The caller must not mutate state until _wait_for_state_write returns.
+        """
+        self._state_write = asyncio.ensure_future(asyncio.to_thread(save_product_state, state))
+
+    async def _wait_for_state_write(self) -> None:
+        """Wait for a pending write-behind so later writes land after it."""
+        state_write, self._state_write = self._state_write, None
+        if state_write is None:
+            return
+        try:
+            await state_write
+        except Exception as exc:  # The flow's final write supersedes it
+            logger.warning("[product-pipeline] Background state write failed: %s", exc)
+
+    async def _save_state(self, state: ProductState) -> None:
+        """Persist state off the event loop, after any pending write-behind."""
+        await self._wait_for_state_write()
+        await asyncio.to_thread(save_product_state, state)
+
+    def _create_run_dir(self, label: str, run_stamp: int) -> Optional[Path]:
+        """Create the directory holding one run's debug artifacts (Gemini images, Trellis outputs, state)."""
+        run_dir = ARTIFACTS_DIR / f"{label}_{run_stamp}"
+        try:
+            run_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            logger.warning(f"[product-pipeline] Failed to create artifacts dir: {exc}")
+            return None
+        return run_dir
 
-    def _save_gemini_images(self, images: List[str], mode: str) -> None:
+    async def _save_gemini_images(self, images: List[str], run_dir: Path) -> None:
         """Save Gemini-generated images to filesystem for test inspection.
         
         Note: In normal operation, images are already stored in Redis as base64
         data URLs in ProductState.images. This method is for debugging only.
+        Each image is decoded and written on a worker thread so the event loop
+        stays free.
         """
-        try:
-            run_dir = ARTIFACTS_DIR / f"gemini_{mode}_{int(time.time())}"
-            run_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"[product-pipeline] Saving {len(images)} Gemini images to {run_dir}")
-            
-            for idx, img in enumerate(images, start=1):
-                logger.info(f"[product-pipeline] Processing image {idx}, type: {type(img)}, starts with data:image: {isinstance(img, str) and img.startswith('data:image')}")
-                if isinstance(img, str) and img.startswith("data:image"):
-                    try:
-                        header, b64_data = img.split(",", 1)
-                        mime = header.split(";")[0].split(":")[1] if ":" in header else "image/png"
-                        extension = mime.split("/")[-1] if "/" in mime else "png"
-                        dest = run_dir / f"gemini_view_{idx}.{extension}"
-                        dest.write_bytes(base64.b64decode(b64_data))
-                        logger.info(f"[product-pipeline] ✓ Saved Gemini image {idx} to {dest}")
-                    except Exception as exc:
-                        logger.warning(f"[product-pipeline] Failed to save Gemini image {idx}: {exc}")
+        saved = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._write_gemini_image, run_dir, idx, img)
+                for idx, img in enumerate(images, start=1)
+            )
+        )
+        logger.info("[product-pipeline] Saved %d/%d Gemini images to %s", sum(saved), len(images), run_dir)
+
+    def _write_gemini_image(self, run_dir: Path, idx: int, img: str) -> bool:
+        """Decode one Gemini data URL into run_dir (runs on a worker thread); True if saved."""
+        if isinstance(img, str) and img.startswith("data:image"):
+            try:
+                if img.startswith(_PNG_DATA_URL_PREFIX):
+                    # Fast path: Gemini always returns PNG data URLs
+                    extension, b64_data = "png", img[len(_PNG_DATA_URL_PREFIX):]
                 else:
-                    logger.warning(f"[product-pipeline] Skipping image {idx} - not a data URL (preview: {str(img)[:100]})")
-        except Exception as exc:
-            logger.warning(f"[product-pipeline] Failed to create artifacts dir: {exc}")
+                    header, b64_data = img.split(",", 1)
+                    mime = header.split(";")[0].split(":")[1] if ":" in header else "image/png"
+                    extension = mime.split("/")[-1] if "/" in mime else "png"
+                dest = run_dir / f"gemini_view_{idx}.{extension}"
+                # a2b_base64 decodes the ASCII str directly, skipping the
+                # intermediate bytes copy base64.b64decode makes of a str input
+                dest.write_bytes(binascii.a2b_base64(b64_data))
+                logger.debug("[product-pipeline] ✓ Saved Gemini image %d to %s", idx, dest)
+                return True
+            except Exception as exc:
+                logger.warning("[product-pipeline] Failed to save Gemini image %d: %s", idx, exc)
+        else:
+            logger.warning("[product-pipeline] Skipping image %d - not a data URL (preview: %.100s)", idx, img)
+        return False
 
-    def _save_trellis_model(self, artifacts: TrellisArtifacts, mode: str) -> None:
+    async def _save_artifacts(self, state: ProductState, artifacts: TrellisArtifacts, run_dir: Path) -> None:
+        """Save Trellis downloads, then the state snapshot alongside them."""
+        await self._save_trellis_model(artifacts, run_dir)
+        self._save_product_state(state, run_dir)
+
+    async def _save_trellis_model(self, artifacts: TrellisArtifacts, run_dir: Path) -> None:
         """Download and save Trellis artifacts to filesystem for test/demo inspection.
         
         Note: In normal operation, Trellis URLs are already stored in Redis via
         ProductState.trellis_output. This method downloads and saves for debugging/demo.
+        All artifacts are fetched concurrently, so the save takes as long as the
+        slowest download rather than the sum of them.
         """
         try:
             if not artifacts.model_file:
                 logger.warning("[product-pipeline] No model_file to save")
                 return
             
-            run_dir = ARTIFACTS_DIR / f"trellis_{mode}_{int(time.time())}"
-            run_dir.mkdir(parents=True, exist_ok=True)
-            
-            import urllib.request
-            from urllib.error import URLError
-            
-            # Download GLB model
-            glb_path = run_dir / "model.glb"
-            logger.info("[product-pipeline] Downloading GLB from %s...", artifacts.model_file[:80])
-            with urllib.request.urlopen(artifacts.model_file) as response:
-                glb_path.write_bytes(response.read())
-            logger.info("[product-pipeline] ✓ Saved GLB model to %s (%.1f KB)", glb_path, glb_path.stat().st_size / 1024)
-            
-            # Download videos if available
+            # GLB model first, then videos and no-background images if available
+            downloads: List[Tuple[str, Path]] = [(artifacts.model_file, run_dir / "model.glb")]
             video_assets = [
                 ("color_video", "trellis_color.mp4"),
                 ("normal_video", "trellis_normal.mp4"),
@@ -362,54 +601,67 @@ class ProductPipelineService:
             for attr_name, filename in video_assets:
                 url = getattr(artifacts, attr_name, None)
                 if url:
-                    try:
-                        video_path = run_dir / filename
-                        logger.info(f"[product-pipeline] Downloading {attr_name}...")
-                        with urllib.request.urlopen(url) as response:
-                            video_path.write_bytes(response.read())
-                        logger.info(f"[product-pipeline] ✓ Saved {filename} (%.1f KB)", video_path.stat().st_size / 1024)
-                    except URLError as exc:
-                        logger.warning(f"[product-pipeline] Failed to download {attr_name}: {exc}")
+                    downloads.append((url, run_dir / filename))
             
-            # Download no-background images if available
             if artifacts.no_background_images:
                 no_bg_dir = run_dir / "no_background"
                 no_bg_dir.mkdir(exist_ok=True)
                 for idx, img_url in enumerate(artifacts.no_background_images, start=1):
-                    try:
-                        img_path = no_bg_dir / f"no_bg_{idx}.png"
-                        logger.info(f"[product-pipeline] Downloading no-bg image {idx}...")
-                        with urllib.request.urlopen(img_url) as response:
-                            img_path.write_bytes(response.read())
-                        logger.info(f"[product-pipeline] ✓ Saved no_bg_{idx}.png (%.1f KB)", img_path.stat().st_size / 1024)
-                    except URLError as exc:
-                        logger.warning(f"[product-pipeline] Failed to download no-bg image {idx}: {exc}")
+                    downloads.append((img_url, no_bg_dir / f"no_bg_{idx}.png"))
+            
+            client = _get_artifact_client()
+            semaphore = asyncio.Semaphore(ARTIFACT_DOWNLOAD_CONCURRENCY)
+            # Completion is already reported to the UI, so progress goes to the log
+            # as each download lands rather than after the slowest one
+            saved = 0
+            pending = [self._download_artifact(client, semaphore, url, path) for url, path in downloads]
+            for finished, download in enumerate(asyncio.as_completed(pending), start=1):
+                saved += await download
+                logger.debug("[product-pipeline] %d/%d Trellis downloads finished", finished, len(downloads))
+            logger.info("[product-pipeline] Saved %d/%d Trellis artifacts to %s", saved, len(downloads), run_dir)
                 
         except Exception as exc:
             logger.warning(f"[product-pipeline] Failed to save Trellis artifacts: {exc}")
 
-    def _save_product_state(self, state: ProductState, mode: str) -> None:
+    async def _download_artifact(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        path: Path,
+    ) -> bool:
+        """Download one artifact to path; failures are logged, not raised. True if saved."""
+        async with semaphore:
+            try:
+                logger.debug("[product-pipeline] Downloading %s from %.80s...", path.name, url)
+                # Stream to disk; GLBs and videos can be tens of MB. No chunk_size:
+                # re-chunking copies every byte through a buffer, while network
+                # chunks can be written as they arrive.
+                async with client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    with path.open("wb") as f:
+                        async for chunk in response.aiter_bytes():
+                            f.write(chunk)
+                logger.debug("[product-pipeline] ✓ Saved %s (%.1f KB)", path, path.stat().st_size / 1024)
+                return True
+            except (httpx.HTTPError, OSError) as exc:
+                logger.warning("[product-pipeline] Failed to download %s: %s", path.name, exc)
+                return False
+
+    def _save_product_state(self, state: ProductState, run_dir: Path) -> None:
         """Save the full product state as JSON for test/demo inspection.
         
         This creates a comprehensive snapshot of the entire generation session
-        including all iterations, prompts, and artifact URLs.
+        including all iterations, prompts, and artifact URLs, next to the
+        Trellis artifacts saved in run_dir.
         """
         try:
-            import json
-            
-            # Find the most recent Trellis artifact directory
-            trellis_dirs = sorted(ARTIFACTS_DIR.glob(f"trellis_{mode}_*"), key=lambda p: p.name)
-            if not trellis_dirs:
-                logger.warning("[product-pipeline] No Trellis artifact directory found for state save")
-                return
-            
-            run_dir = trellis_dirs[-1]  # Most recent
             state_path = run_dir / "state.json"
             
             # Convert state to JSON-serializable dict
             state_dict = state.as_json()
             
-            state_path.write_text(json.dumps(state_dict, indent=2))
+            state_path.write_bytes(orjson.dumps(state_dict, option=orjson.OPT_INDENT_2))
             logger.info(f"[product-pipeline] ✓ Saved product state to {state_path}")
             
         except Exception as exc:
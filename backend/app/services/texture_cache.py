@@ -0,0 +1,127 @@
+"""Disk-backed LRU cache for generated panel textures.
+
+Regenerating a panel with an identical prompt, reference image and workflow
+returns the cached texture instead of spending another Gemini roundtrip.
+Entries are PNG files named by key; a file's mtime is its last use, and the
+oldest entries are evicted once the directory exceeds its size budget.
+Opt-in via CACHE_PANEL_TEXTURES: otherwise regenerating is expected to
+produce a new variant.
+"""
+import base64
+import hashlib
+import logging
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+TEXTURE_CACHE_DIR = Path(__file__).resolve().parents[2] / "texture_cache"
+TEXTURE_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2GB
+
+_PNG_DATA_URL_PREFIX = "data:image/png;base64,"
+
+
+def texture_cache_key(
+    enhanced_prompt: str,
+    workflow: str,
+    reference_images: Optional[List[str]] = None,
+) -> str:
+    """Hash everything that determines a generated texture.
+
+    Face name and panel dimensions are already rendered into the enhanced
+    prompt, so they are covered by hashing it.
+    """
+    reference_sha256 = b"".join(_reference_digest(image) for image in reference_images or ())
+    return hashlib.blake2b(
+        _prompt_digest(enhanced_prompt) + reference_sha256 + workflow.encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+@lru_cache(maxsize=4)
+def _reference_digest(image: str) -> bytes:
+    """Hash a reference image once; all panels of a package share the same mockup."""
+    return hashlib.sha256(image.encode()).digest()
+
+
+@lru_cache(maxsize=512)
+def _prompt_digest(enhanced_prompt: str) -> bytes:
+    """UTF-8 encode and hash a prompt once; built prompts are memoized and repeat often."""
+    return hashlib.blake2b(enhanced_prompt.encode(), digest_size=16).digest()
+
+
+class TextureCache:
+    """Persistent texture cache with mtime-based LRU eviction.
+
+    Methods do blocking file I/O; call them via asyncio.to_thread.
+    """
+
+    def __init__(self, cache_dir: Path = TEXTURE_CACHE_DIR, max_bytes: int = TEXTURE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # Scanned from disk on first write
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached texture as a data URL, or None on a miss."""
+        path = self.cache_dir / f"{key}.png"
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("[texture-cache] Failed to read %s: %s", path.name, e)
+            return None
+        return _PNG_DATA_URL_PREFIX + base64.b64encode(data).decode("ascii")
+
+    def put(self, key: str, texture_url: str) -> None:
+        """Write a texture through to disk, evicting old entries if over budget."""
+        if not texture_url.startswith(_PNG_DATA_URL_PREFIX):
+            return
+        data = base64.b64decode(texture_url[len(_PNG_DATA_URL_PREFIX):])
+        path = self.cache_dir / f"{key}.png"
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+
+        with self._lock:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                if self._total_bytes is None:
+                    self._total_bytes = sum(entry.stat().st_size for entry in self.cache_dir.glob("*.png"))
+                previous_size = path.stat().st_size if path.exists() else 0
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)  # Readers never see a partial file
+            except OSError as e:
+                logger.warning("[texture-cache] Failed to write %s: %s", path.name, e)
+                tmp_path.unlink(missing_ok=True)
+                return
+
+            self._total_bytes += len(data) - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits its budget."""
+        entries = []
+        for entry in self.cache_dir.glob("*.png"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+        self._total_bytes = total
+        logger.info("[texture-cache] Evicted down to %.1fMB", total / 1024 ** 2)
+
+
+texture_cache = TextureCache()
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.endpoints.packaging.router import router as packaging_router
@@ -9,7 +11,17 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-app = FastAPI(title="Trellis 3D Generation API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled connections held by the product pipeline's download client
+    try:
+        from app.services.product_pipeline import close_artifact_client
+    except ImportError:
+        return
+    await close_artifact_client()
+
+app = FastAPI(title="Trellis 3D Generation API", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
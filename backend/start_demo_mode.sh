@@ -16,11 +16,9 @@ echo ""
 echo "📁 Artifacts will be saved to:"
 echo "   backend/tests/artifacts/"
 echo ""
-echo "📂 Each generation creates timestamped folders:"
-echo "   - gemini_create_* (AI-generated images)"
-echo "   - trellis_create_* (3D models, videos, state)"
-echo "   - gemini_edit_* (edit images)"
-echo "   - trellis_edit_* (edited models)"
+echo "📂 Each generation creates one timestamped folder:"
+echo "   - create_* (AI-generated images, 3D model, videos, state)"
+echo "   - edit_* (edit images, edited model)"
 echo ""
 echo "============================================"
 
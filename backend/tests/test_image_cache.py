@@ -0,0 +1,35 @@
+import base64
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.image_cache import ProductImageCache, product_images_key
+
+
+def _png_url(payload: bytes) -> str:
+    return "data:image/png;base64," + base64.b64encode(payload).decode("ascii")
+
+
+def test_key_covers_request_and_skips_remote_references():
+    base = product_images_key("speaker", "create", 3)
+
+    assert base == product_images_key("speaker", "create", 3, [], None)
+    assert base != product_images_key("speaker", "create", 2)
+    assert base != product_images_key("speaker", "edit", 3)
+    assert base != product_images_key("speaker", "create", 3, base_description="desk speaker")
+    assert base != product_images_key("speaker", "create", 3, [_png_url(b"ref")])
+    assert product_images_key("speaker", "edit", 3, ["https://cdn.local/ref.png"]) is None
+
+
+def test_views_are_returned_only_as_a_complete_set(tmp_path):
+    cache = ProductImageCache(cache_dir=tmp_path)
+    views = [_png_url(b"view-1"), _png_url(b"view-2")]
+
+    cache.put("key", views)
+
+    assert cache.get("key", 2) == views
+    (tmp_path / "key_1.png").unlink()
+    assert cache.get("key", 2) is None
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+import asyncio
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.panel_generation import PanelGenerationService
+
+PANEL_SPEC = {
+    "panel_id": "front",
+    "prompt": "Minimal matte black coffee packaging with a gold logo",
+    "package_type": "box",
+    "panel_dimensions": {"width": 100, "height": 150},
+    "package_dimensions": {"width": 100, "height": 150, "depth": 100},
+}
+
+
+def _service_with_gemini(monkeypatch, call_gemini):
+    service = PanelGenerationService()
+    monkeypatch.setattr(service, "_call_gemini", call_gemini)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_only_caller_cancels_the_gemini_call(monkeypatch):
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_gemini(enhanced_prompt, workflow, reference_images):
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return ["texture"]
+
+    service = _service_with_gemini(monkeypatch, slow_gemini)
+    caller = asyncio.ensure_future(service.generate_panel_texture(**PANEL_SPEC))
+    await started.wait()
+    caller.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert not service._inflight
+    assert not service._inflight_waiters
+
+
+@pytest.mark.asyncio
+async def test_shared_generation_survives_one_caller_cancelling(monkeypatch):
+    release = asyncio.Event()
+    calls = []
+
+    async def gated_gemini(enhanced_prompt, workflow, reference_images):
+        calls.append(enhanced_prompt)
+        await release.wait()
+        return ["texture"]
+
+    service = _service_with_gemini(monkeypatch, gated_gemini)
+    first = asyncio.ensure_future(service.generate_panel_texture(**PANEL_SPEC))
+    second = asyncio.ensure_future(service.generate_panel_texture(**PANEL_SPEC))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "texture"
+    assert len(calls) == 1
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_leaving_the_stream_early_cancels_unfinished_panels(monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def gemini(enhanced_prompt, workflow, reference_images):
+        if "BACK" not in enhanced_prompt.upper():
+            return ["front-texture"]
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return ["back-texture"]
+
+    service = _service_with_gemini(monkeypatch, gemini)
+    stream = service.generate_panels_streaming([PANEL_SPEC, {**PANEL_SPEC, "panel_id": "back"}])
+    assert await stream.__anext__() == ("front", "front-texture")
+    await stream.aclose()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.panel_prompt_templates import PanelPromptBuilder, panel_prompt_builder
+
+
+@pytest.mark.parametrize(
+    "width, height, expected",
+    [
+        (100, 150, "2:3"),
+        (160, 90, "16:9"),
+        (100, 100, "1:1"),
+        (0, 100, "1:1"),
+        (133.3, 100, "4:3"),
+        (137, 100, "137:100"),
+        (101.3, 57, "16:9"),
+        (123.4, 56.7, "37:17"),
+    ],
+)
+def test_calculate_aspect_ratio(width, height, expected):
+    assert PanelPromptBuilder.calculate_aspect_ratio(width, height) == expected
+
+
+def test_simple_prompt_is_memoized():
+    kwargs = dict(face_name="front", panel_width_mm=100, panel_height_mm=150, user_prompt="blue geometric pattern")
+    first = panel_prompt_builder.build_simple_prompt(**kwargs)
+    second = panel_prompt_builder.build_simple_prompt(**kwargs)
+
+    assert first is second
+    assert "Aspect Ratio: 2:3 (MUST be exact)" in first
+    assert "blue geometric pattern" in first
+
+
+def test_vague_prompt_is_rejected():
+    with pytest.raises(ValueError, match="too vague"):
+        panel_prompt_builder.build_simple_prompt(
+            face_name="front", panel_width_mm=100, panel_height_mm=150, user_prompt="  Logo "
+        )
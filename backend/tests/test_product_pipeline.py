@@ -35,19 +35,21 @@ async def test_create_flow_persists_assets(monkeypatch):
         "no_background_images": ["https://cdn.local/nobg.png"],
     }
 
-    async def fake_generate_views(prompt, reference_images=None, image_count=3, thinking_level=None):
-        await asyncio.sleep(0)
+    async def fake_generate_views(prompt, workflow, reference_images=None, image_count=3, base_description=None):
+        assert workflow == "create"
         assert reference_images is None
         assert prompt == "New speaker concept"
         assert image_count == 3
-        return sample_images
+        for image in sample_images:
+            await asyncio.sleep(0)
+            yield image
 
     async def fake_generate_trellis(images):
         await asyncio.sleep(0)
-        assert images == sample_images
+        assert images == sample_images[:1]  # Without multi-image, Trellis starts on the first view
         return sample_trellis
 
-    monkeypatch.setattr(gemini.gemini_image_service, "generate_product_images", fake_generate_views)
+    monkeypatch.setattr(gemini.gemini_image_service, "generate_product_images_iter", fake_generate_views)
     monkeypatch.setattr(product_pipeline_service, "_generate_trellis_model", fake_generate_trellis)
 
     await product_pipeline_service.run_create("New speaker concept", image_count=3)
@@ -80,18 +82,20 @@ async def test_edit_flow_uses_previous_images(monkeypatch):
     updated_images = ["edit-1", "edit-2", "edit-3"]
     trellis_data = TrellisArtifacts(model_file="https://cdn.local/new.glb").model_dump(mode="json")
 
-    async def fake_generate_views(prompt, reference_images=None, image_count=3, thinking_level=None):
-        await asyncio.sleep(0)
+    async def fake_generate_views(prompt, workflow, reference_images=None, image_count=3, base_description=None):
+        assert workflow == "edit"
         assert prompt == "Add metallic label"
         assert reference_images == ["existing-image"]
-        return updated_images
+        for image in updated_images:
+            await asyncio.sleep(0)
+            yield image
 
     async def fake_generate_trellis(images):
         await asyncio.sleep(0)
-        assert images == updated_images
+        assert images == updated_images[:1]
         return trellis_data
 
-    monkeypatch.setattr(gemini.gemini_image_service, "generate_product_images", fake_generate_views)
+    monkeypatch.setattr(gemini.gemini_image_service, "generate_product_images_iter", fake_generate_views)
     monkeypatch.setattr(product_pipeline_service, "_generate_trellis_model", fake_generate_trellis)
 
     await product_pipeline_service.run_edit("Add metallic label")
@@ -105,3 +109,30 @@ async def test_edit_flow_uses_previous_images(monkeypatch):
     assert status.status == "complete"
     assert status.model_file == trellis_data["model_file"]
 
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_view_keeps_the_other_views(monkeypatch):
+    """A 429 on one view skips that view instead of failing the flow."""
+    clear_product_state()
+    save_product_status(ProductStatus())
+
+    def fake_single_image(prompt, reference_images, thinking_level, model, angle_index=0, **kwargs):
+        if angle_index == 1:
+            raise gemini.QuotaExceededError("quota", retry_after=10)
+        return f"view-{angle_index}"
+
+    async def fake_generate_trellis(images):
+        await asyncio.sleep(0)
+        return {"model_file": "https://cdn.local/model.glb"}
+
+    monkeypatch.setattr(gemini.gemini_image_service, "client", object())
+    monkeypatch.setattr(gemini.gemini_image_service, "_generate_single_image", fake_single_image)
+    monkeypatch.setattr(product_pipeline_service, "_generate_trellis_model", fake_generate_trellis)
+
+    await product_pipeline_service.run_create("Rate limited speaker", image_count=3)
+
+    state = get_product_state()
+    assert state.images == ["view-0", "view-2"]
+    assert state.trellis_output.model_file == "https://cdn.local/model.glb"
+    assert get_product_status().status == "complete"
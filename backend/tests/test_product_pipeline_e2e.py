@@ -1,13 +1,13 @@
 import base64
-import json
 import os
 import sys
 import time
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.error import URLError, HTTPError
-from typing import Optional
+from typing import List, Optional, Tuple
 
+import httpx
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
@@ -34,6 +34,8 @@ ENV_MISSING = [
 
 ARTIFACT_ROOT = Path(__file__).parent / "artifacts"
 ARTIFACT_ROOT.mkdir(exist_ok=True)
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_TIMEOUT = 60.0
 
 
 pytestmark = pytest.mark.skipif(
@@ -51,19 +53,41 @@ def api_client():
 
 
 def _wait_for_completion(client: TestClient, timeout: int = 1200):
+    try:
+        status = _stream_until_done(client)
+    except httpx.HTTPError as exc:
+        print(f"[e2e] Status stream unavailable, polling instead: {exc}")
+        status = _poll_until_done(client, timeout)
+    if status["status"] == "error":
+        raise AssertionError(f"Pipeline reported error: {status.get('message')}")
+    return status
+
+
+def _stream_until_done(client: TestClient):
+    """Follow /product/status/stream; it closes once the run completes or fails."""
+    status = None
+    with client.stream("GET", "/product/status/stream") as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line.startswith("data: "):
+                status = orjson.loads(line[len("data: "):])
+    if status is None or status["status"] not in ("complete", "error"):
+        raise AssertionError(f"Status stream ended before completion: {status}")
+    return status
+
+
+def _poll_until_done(client: TestClient, timeout: int):
     deadline = time.time() + timeout
     while time.time() < deadline:
         status = client.get("/product/status").json()
-        if status["status"] == "complete":
+        if status["status"] in ("complete", "error"):
             return status
-        if status["status"] == "error":
-            raise AssertionError(f"Pipeline reported error: {status.get('message')}")
         time.sleep(5)
     raise TimeoutError("Timed out waiting for product pipeline to finish")
 
 
 def _ensure_base_product(client: TestClient):
-    state = client.get("/product").json()
+    state = orjson.loads(client.get("/product").content)
     if state.get("trellis_output", {}).get("model_file"):
         return state
     client.post(
@@ -74,36 +98,43 @@ def _ensure_base_product(client: TestClient):
         },
     )
     _wait_for_completion(client)
-    return client.get("/product").json()
+    return orjson.loads(client.get("/product").content)
 
 
 def _persist_assets(state: dict, run_label: str):
     run_dir = ARTIFACT_ROOT / f"{run_label}_{int(time.time())}"
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    (run_dir / "state.json").write_text(json.dumps(state, indent=2))
+    (run_dir / "state.json").write_bytes(orjson.dumps(state, option=orjson.OPT_INDENT_2))
 
-    _save_image_assets(state.get("images") or [], run_dir / "gemini")
+    downloads = _save_image_assets(state.get("images") or [], run_dir / "gemini")
 
     trellis = state.get("trellis_output") or {}
-    _download_if_url(trellis.get("model_file"), run_dir / "trellis_model.glb")
-    _download_if_url(trellis.get("color_video"), run_dir / "trellis_color.mp4")
-    _download_if_url(trellis.get("normal_video"), run_dir / "trellis_normal.mp4")
-    _download_if_url(trellis.get("combined_video"), run_dir / "trellis_combined.mp4")
+    downloads += [
+        (trellis.get("model_file"), run_dir / "trellis_model.glb"),
+        (trellis.get("color_video"), run_dir / "trellis_color.mp4"),
+        (trellis.get("normal_video"), run_dir / "trellis_normal.mp4"),
+        (trellis.get("combined_video"), run_dir / "trellis_combined.mp4"),
+    ]
     no_bg = trellis.get("no_background_images") or []
-    _save_image_assets(no_bg, run_dir / "trellis_no_bg")
+    downloads += _save_image_assets(no_bg, run_dir / "trellis_no_bg")
+
+    _download_all(downloads)
 
 
-def _save_image_assets(images, target_dir: Path):
+def _save_image_assets(images, target_dir: Path) -> List[Tuple[Optional[str], Path]]:
+    """Write inline images now; return remote ones as (url, dest) downloads."""
     if not images:
-        return
+        return []
     target_dir.mkdir(parents=True, exist_ok=True)
+    downloads = []
     for idx, img in enumerate(images, start=1):
         dest = target_dir / f"image_{idx}.png"
         if isinstance(img, str) and img.startswith("data:image"):
             _write_data_url(img, dest)
         else:
-            _download_if_url(img, dest)
+            downloads.append((img, dest))
+    return downloads
 
 
 def _write_data_url(data_url: str, dest: Path):
@@ -117,14 +148,25 @@ def _write_data_url(data_url: str, dest: Path):
         print(f"[e2e] Failed to decode inline image: {exc}")
 
 
-def _download_if_url(url: Optional[str], dest: Path):
+def _download_all(downloads: List[Tuple[Optional[str], Path]]):
+    """Fetch all assets in parallel over one pooled client."""
+    with httpx.Client(timeout=DOWNLOAD_TIMEOUT, follow_redirects=True) as client, \
+            ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        list(pool.map(lambda job: _download_if_url(client, *job), downloads))
+
+
+def _download_if_url(client: httpx.Client, url: Optional[str], dest: Path):
     if not url:
         return
     try:
-        with urllib.request.urlopen(url) as response:
-            dest.write_bytes(response.read())
-    except URLError as exc:
+        # Stream to disk; GLBs and videos can be tens of MB
+        with client.stream("GET", url) as response, dest.open("wb") as f:
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+    except (httpx.HTTPError, OSError) as exc:
         print(f"[e2e] Failed to download {url}: {exc}")
+        dest.unlink(missing_ok=True)
 
 
 def test_product_create_flow_real(api_client):
@@ -148,7 +190,7 @@ def test_product_create_flow_real(api_client):
     assert status["status"] == "complete"
     assert status.get("model_file")
 
-    state = api_client.get("/product").json()
+    state = orjson.loads(api_client.get("/product").content)
     _persist_assets(state, "create")
     
     elapsed = time.time() - start_time
@@ -185,7 +227,7 @@ def test_product_edit_flow_real(api_client):
     assert status["status"] == "complete"
     assert status.get("model_file")
 
-    state = api_client.get("/product").json()
+    state = orjson.loads(api_client.get("/product").content)
     _persist_assets(state, "edit")
     
     elapsed = time.time() - start_time
@@ -0,0 +1,74 @@
+import base64
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.redis import redis_service
+from app.models.product_state import (
+    PRODUCT_STATE_KEY,
+    PRODUCT_STATUS_KEY,
+    ProductIteration,
+    ProductState,
+    ProductStatus,
+    add_status_listener,
+    get_product_state,
+    get_product_status,
+    save_product_state,
+    save_product_status,
+)
+
+
+def _png_url(payload: bytes) -> str:
+    return "data:image/png;base64," + base64.b64encode(payload).decode("ascii")
+
+
+def test_state_round_trips_with_images_packed_once():
+    image = _png_url(b"\x89PNG" + bytes(range(256)) * 40)
+    other = _png_url(b"other image")
+    unpadded = _png_url(b"ab").rstrip("=")  # Not canonical base64; stored verbatim
+    state = ProductState(
+        prompt="speaker",
+        images=[image, other],
+        iterations=[
+            ProductIteration(id="iter_1", prompt="speaker", images=[image, "https://cdn.local/view.png"]),
+            ProductIteration(id="iter_2", prompt="edit", images=[other, unpadded]),
+        ],
+    )
+
+    save_product_state(state)
+    stored = redis_service.get_bytes(PRODUCT_STATE_KEY)
+    loaded = get_product_state()
+
+    assert loaded.as_json() == state.as_json()
+    assert len(stored) < len(image) + len(other)  # Each image stored once, without base64
+
+
+def test_legacy_json_state_still_loads():
+    redis_service.set(PRODUCT_STATE_KEY, json.dumps(ProductState(prompt="legacy").as_json()))
+
+    assert get_product_state().prompt == "legacy"
+
+
+def test_status_listeners_run_on_each_write_until_removed():
+    calls = []
+    remove_listener = add_status_listener(lambda: calls.append(1))
+
+    save_product_status(ProductStatus(status="generating_model", progress=50))
+    save_product_status(ProductStatus(status="generating_model", progress=50))
+    remove_listener()
+    save_product_status(ProductStatus(status="complete", progress=100))
+
+    assert len(calls) == 2
+
+
+def test_repeated_status_is_written_after_another_writer_changed_it():
+    save_product_status(ProductStatus(status="complete", progress=100))
+    redis_service.set_json(PRODUCT_STATUS_KEY, ProductStatus(status="idle").as_json())  # e.g. another worker
+
+    save_product_status(ProductStatus(status="complete", progress=100))
+
+    assert get_product_status().status == "complete"
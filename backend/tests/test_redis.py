@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.redis import RedisService
+
+
+def _fallback_service() -> RedisService:
+    service = RedisService("redis://localhost:1/0")
+    service._use_fallback = True
+    return service
+
+
+def test_fallback_get_returns_text_for_json_payloads():
+    service = _fallback_service()
+    service.set_json("key", {"status": "idle"})
+
+    assert service.get("key") == '{"status":"idle"}'
+    assert service.get_json("key") == {"status": "idle"}
+    assert service.get_bytes("key") == b'{"status":"idle"}'
+
+
+def test_save_many_sets_each_key_with_the_given_expiry():
+    class FakePipeline:
+        def __init__(self):
+            self.calls = []
+
+        def set(self, key, value, ex=None):
+            self.calls.append((key, value, ex))
+
+        def execute(self):
+            return [True] * len(self.calls)
+
+    service = RedisService("redis://localhost:1/0")
+    pipe = FakePipeline()
+    service._binary_client = type("FakeClient", (), {"pipeline": lambda self: pipe})()
+
+    assert service.save_many([("state", b"raw"), ("status", {"status": "idle"})], ex=60)
+    assert pipe.calls == [("state", b"raw", 60), ("status", b'{"status":"idle"}', 60)]
+
+
+def test_fallback_save_many_matches_single_key_writes():
+    service = _fallback_service()
+    service.save_many([("status", {"status": "idle"})])
+
+    assert service.get("status") == '{"status":"idle"}'
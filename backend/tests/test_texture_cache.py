@@ -0,0 +1,40 @@
+import base64
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.texture_cache import TextureCache, texture_cache_key
+
+
+def _png_url(payload: bytes) -> str:
+    return "data:image/png;base64," + base64.b64encode(payload).decode("ascii")
+
+
+def test_key_depends_on_prompt_workflow_and_references():
+    base = texture_cache_key("prompt", "create", None)
+
+    assert base == texture_cache_key("prompt", "create", [])
+    assert base != texture_cache_key("prompt", "edit", None)
+    assert base != texture_cache_key("prompt 2", "create", None)
+    assert base != texture_cache_key("prompt", "create", [_png_url(b"ref")])
+
+
+def test_round_trip_and_lru_eviction(tmp_path):
+    cache = TextureCache(cache_dir=tmp_path, max_bytes=250)
+
+    assert cache.get("a") is None
+    cache.put("a", _png_url(b"a" * 100))
+    cache.put("b", _png_url(b"b" * 100))
+    os.utime(tmp_path / "a.png", (1, 1))
+    os.utime(tmp_path / "b.png", (2, 2))
+    assert cache.get("a") == _png_url(b"a" * 100)  # Refreshes "a"; "b" is now oldest
+
+    cache.put("c", _png_url(b"c" * 100))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None